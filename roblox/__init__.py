@@ -18,7 +18,8 @@ import logging
 
 from .client import Client
 from .creatortype import CreatorType
-from .thumbnails import ThumbnailState, ThumbnailFormat, ThumbnailReturnPolicy, AvatarThumbnailType
+from .thumbnails import ThumbnailState, ThumbnailFormat, ThumbnailReturnPolicy, AvatarThumbnailType, ThumbnailBatchType, \
+    ThumbnailBatchRequest
 from .universes import UniverseGenre, UniverseAvatarType
 from .utilities.exceptions import *
 from .utilities.types import *
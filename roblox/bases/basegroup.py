@@ -155,13 +155,14 @@ class BaseGroup(BaseItem):
             }
         )
 
-    def get_members(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_members(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                     max_items: int = None) -> PageIterator:
         """
         Gets all members of a group.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -276,13 +277,14 @@ class BaseGroup(BaseItem):
             url=self._client.url_generator.get_url("groups", f"v1/groups/{self.id}/users/{int(user)}")
         )
 
-    def get_wall_posts(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_wall_posts(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                        max_items: int = None) -> PageIterator:
         """
         Gets all members of a group.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -313,13 +315,14 @@ class BaseGroup(BaseItem):
             group=self
         )
 
-    def get_join_requests(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_join_requests(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                           max_items: int = None) -> PageIterator:
         """
         Gets all of this group's join requests.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -6,7 +6,7 @@ It also contains the UniverseLiveStats object, which represents a universe's liv
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from .baseitem import BaseItem
 from ..gamepasses import GamePass
@@ -85,13 +85,14 @@ class BaseUniverse(BaseItem):
         is_favorited_data = is_favorited_response.json()
         return is_favorited_data["isFavorited"]
 
-    def get_badges(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_badges(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                    max_items: int = None) -> PageIterator:
         """
         Gets the universe's badges.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -122,13 +123,14 @@ class BaseUniverse(BaseItem):
         stats_data = stats_response.json()
         return UniverseLiveStats(data=stats_data)
 
-    def get_gamepasses(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_gamepasses(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                        max_items: int = None) -> PageIterator:
         """
         Gets the universe's gamepasses.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -57,13 +57,14 @@ class BaseUser(BaseItem):
         return status_data["status"]
 
     def username_history(
-            self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending, max_items: int = None
+            self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending, max_items: int = None
     ) -> PageIterator:
         """
         Grabs the user's username history.
 
         Arguments:
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -88,11 +89,7 @@ class BaseUser(BaseItem):
         Returns:
             The user's presence, if they have an active presence.
         """
-        presences = await self._client.presence.get_user_presences([self.id])
-        try:
-            return presences[0]
-        except IndexError:
-            return None
+        return await self._client.presence.get_user_presence(self.id)
 
     async def get_friends(self) -> List[Friend]:
         """
@@ -290,7 +287,7 @@ class BaseUser(BaseItem):
     def _get_friend_channel_iterator(
             self,
             channel: str,
-            page_size: int = 10,
+            page_size: Optional[int] = None,
             sort_order: SortOrder = SortOrder.Ascending, max_items: int = None
     ) -> PageIterator:
         from ..friends import Friend
@@ -332,7 +329,7 @@ class BaseUser(BaseItem):
 
     def get_followers(
             self,
-            page_size: int = 10,
+            page_size: Optional[int] = None,
             sort_order: SortOrder = SortOrder.Ascending, max_items: int = None
     ) -> PageIterator:
         """
@@ -350,7 +347,7 @@ class BaseUser(BaseItem):
 
     def get_followings(
             self,
-            page_size: int = 10,
+            page_size: Optional[int] = None,
             sort_order: SortOrder = SortOrder.Ascending, max_items: int = None
     ) -> PageIterator:
         """
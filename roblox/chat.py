@@ -78,15 +78,19 @@ class ChatProvider:
         settings_data = settings_response.json()
         return ChatSettings(data=settings_data)
 
-    def get_user_conversations(self):
+    def get_user_conversations(self, concurrency: int = 1):
         """
         Gets the user's conversations.
 
+        Arguments:
+            concurrency: How many pages are requested at once.
+
         Returns: 
             The user's conversations as a PageNumberIterator.
         """
         return PageNumberIterator(
             client=self._client,
             url=self._client.url_generator.get_url("chat", "v2/get-user-conversations"),
-            handler=lambda client, data: Conversation(client=client, data=data)
+            handler=lambda client, data: Conversation(client=client, data=data),
+            concurrency=concurrency
         )
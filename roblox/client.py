@@ -4,7 +4,11 @@ Contains the Client, which is the core object at the center of all ro.py applica
 
 """
 
-from typing import Union, List, Optional
+from __future__ import annotations
+
+from typing import Awaitable, Union, List, Optional
+
+from httpx import Timeout
 
 from .account import AccountProvider
 from .assets import EconomyAsset
@@ -29,10 +33,22 @@ from .universes import Universe
 from .users import User
 from .utilities.exceptions import BadRequest, NotFound, AssetNotFound, BadgeNotFound, GroupNotFound, PlaceNotFound, \
     PluginNotFound, UniverseNotFound, UserNotFound
+from .utilities.batching import Batcher, gather_chunks, gather_with_concurrency
+from .utilities.cache import CacheBackend, ResponseCache
 from .utilities.iterators import PageIterator
-from .utilities.requests import Requests
+from .utilities.ratelimit import RateLimiter
+from .utilities.requests import CleanAsyncClient, Requests
+from .utilities.retry import RetryPolicy
 from .utilities.url import URLGenerator
 
+_users_batch_size = 100
+_usernames_batch_size = 100
+_lookup_batch_size = 50
+
+
+async def _map_by_id(items: Awaitable[list]) -> dict:
+    return {item.id: item for item in await items}
+
 
 class Client:
     """
@@ -46,22 +62,108 @@ class Client:
         delivery: The delivery provider object.
         chat: The chat provider object.
         account: The account provider object.
+        max_concurrency: The maximum amount of requests sent at once when a method splits its work into several requests.
+        batch_lookups: Whether single lookups made around the same time are combined into batch requests.
+        batch_delay: How long, in seconds, batched lookups wait for more lookups before their request is sent.
     """
 
-    def __init__(self, token: str = None, base_url: str = "roblox.com"):
+    def __init__(
+            self,
+            token: str = None,
+            base_url: str = "roblox.com",
+            rate_limiter: Optional[RateLimiter] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            max_connections: Optional[int] = 256,
+            max_keepalive_connections: Optional[int] = 64,
+            keepalive_expiry: Optional[float] = 30.0,
+            timeout: Union[Timeout, float, None] = None,
+            http2: bool = False,
+            coalesce_requests: bool = False,
+            cache: Optional[ResponseCache] = None,
+            thumbnail_cache: Optional[CacheBackend] = None,
+            thumbnail_cache_ttl: Optional[float] = 3600.0,
+            max_concurrency: int = 10,
+            batch_lookups: bool = False,
+            batch_delay: float = 0.01,
+            requests: Optional[Requests] = None
+    ):
         """
         Arguments:
             token: A .ROBLOSECURITY token to authenticate the client with.
             base_url: The base URL to use when sending requests.
+            rate_limiter: A rate limiter used to pace requests to each subdomain.
+            retry_policy: A policy used to retry failed requests.
+            max_connections: The maximum amount of open connections. None means no limit.
+            max_keepalive_connections: The maximum amount of idle connections kept open for reuse.
+            keepalive_expiry: How long, in seconds, an idle connection is kept open.
+            timeout: A httpx.Timeout with per-phase timeouts, or a number of seconds used for all of them.
+            http2: Whether to use HTTP/2. This requires the h2 package (`pip install roblox[http2]`).
+            coalesce_requests: Whether concurrent identical GET requests, like several get_user(1) calls at the same
+                               time, share a single in-flight request.
+            cache: A cache to store GET responses in, so slowly changing objects aren't fetched again every time.
+            thumbnail_cache: A cache backend to store completed thumbnails in, like a MemoryCacheBackend.
+            thumbnail_cache_ttl: How long, in seconds, completed thumbnails are cached for.
+            max_concurrency: The maximum amount of requests sent at once when a method splits its work into several
+                             requests, like get_users with more user IDs than fit in a single request.
+            batch_lookups: Whether get_universe, get_place, get_plugin and PresenceProvider.get_user_presence calls
+                           made around the same time are combined into a single request to the matching batch
+                           endpoint.
+            batch_delay: How long, in seconds, batched lookups wait for more lookups before their request is sent.
+            requests: An existing Requests object to share its connection pool with other Clients. When this is passed,
+                      the session options above are ignored and closing this Client will not close the pool.
+                      Note that the token is stored on the shared session, so it is shared too.
         """
         self._url_generator: URLGenerator = URLGenerator(base_url=base_url)
-        self._requests: Requests = Requests()
+        self._owns_requests: bool = requests is None
+        self._requests: Requests = requests or Requests(
+            session=CleanAsyncClient(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                http2=http2
+            ),
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            coalesce_requests=coalesce_requests,
+            cache=cache
+        )
+
+        if self._owns_requests:
+            self._requests.xcsrf_token_url = self._url_generator.get_url("auth", "v2/logout")
 
         self.url_generator: URLGenerator = self._url_generator
         self.requests: Requests = self._requests
+        self.max_concurrency: int = max_concurrency
+        self.batch_lookups: bool = batch_lookups
+        self.batch_delay: float = batch_delay
+
+        self._universe_batcher: Optional[Batcher[int, Universe]] = None
+        self._place_batcher: Optional[Batcher[int, Place]] = None
+        self._plugin_batcher: Optional[Batcher[int, Plugin]] = None
+        if batch_lookups:
+            self._universe_batcher = Batcher(
+                function=lambda universe_ids: _map_by_id(self.get_universes(universe_ids)),
+                max_batch_size=_lookup_batch_size,
+                delay=batch_delay
+            )
+            self._place_batcher = Batcher(
+                function=lambda place_ids: _map_by_id(self.get_places(place_ids)),
+                max_batch_size=_lookup_batch_size,
+                delay=batch_delay
+            )
+            self._plugin_batcher = Batcher(
+                function=lambda plugin_ids: _map_by_id(self.get_plugins(plugin_ids)),
+                max_batch_size=_lookup_batch_size,
+                delay=batch_delay
+            )
 
         self.presence: PresenceProvider = PresenceProvider(client=self)
-        self.thumbnails: ThumbnailProvider = ThumbnailProvider(client=self)
+        self.thumbnails: ThumbnailProvider = ThumbnailProvider(
+            client=self,
+            cache=thumbnail_cache,
+            cache_ttl=thumbnail_cache_ttl
+        )
         self.delivery: DeliveryProvider = DeliveryProvider(client=self)
         self.chat: ChatProvider = ChatProvider(client=self)
         self.account: AccountProvider = AccountProvider(client=self)
@@ -72,6 +174,35 @@ class Client:
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
 
+    async def __aenter__(self) -> Client:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    # Lifecycle
+    async def aclose(self) -> None:
+        """
+        Closes the connection pool used by this client. Calling this more than once does nothing.
+        If the client was created with a shared Requests object, the pool is left open for its other users.
+        """
+        if self._owns_requests:
+            await self._requests.aclose()
+
+    async def warm_up(self, subdomains: List[str], connections: int = 1) -> None:
+        """
+        Opens pooled connections to the passed subdomains ahead of time, so the first real requests to them don't pay for
+        the TCP and TLS handshakes.
+
+        Arguments:
+            subdomains: Subdomain names, like "users" or "groups".
+            connections: How many connections to open to each subdomain.
+        """
+        await self._requests.warm_up(
+            urls=[self._url_generator.get_url(subdomain) for subdomain in subdomains],
+            connections=connections
+        )
+
     # Authentication
     def set_token(self, token: Optional[str] = None) -> None:
         """
@@ -134,63 +265,110 @@ class Client:
             user_ids: List[int],
             exclude_banned_users: bool = False,
             expand: bool = False,
-    ) -> Union[List[PartialUser], List[User]]:
+            return_exceptions: bool = False
+    ) -> Union[List[PartialUser], List[User], List[Union[User, Exception]]]:
         """
         Grabs a list of users corresponding to each user ID in the list.
+        Any amount of user IDs can be passed - they are split into multiple requests when needed. Users are returned in
+        the order they were requested in, and invalid user IDs are left out.
 
         Arguments:
             user_ids: A list of Roblox user IDs.
             exclude_banned_users: Whether to exclude banned users from the data.
             expand: Whether to return a list of Users (2 requests) rather than PartialUsers (1 request)
+                    Users are expanded concurrently, at most max_concurrency at a time.
+            return_exceptions: When expanding, whether a user that fails to expand is returned as the raised exception
+                               in its place instead of the exception being raised for the whole list.
 
         Returns:
             A List of Users or partial users.
         """
-        users_response = await self._requests.post(
-            url=self._url_generator.get_url("users", f"v1/users"),
-            json={"userIds": user_ids, "excludeBannedUsers": exclude_banned_users},
+        # the endpoint doesn't guarantee response order, so we put the results back in the order they were requested in
+        user_ids = list(dict.fromkeys(map(int, user_ids)))
+        users_data = await gather_chunks(
+            function=lambda chunk: self._get_users_data(chunk, exclude_banned_users),
+            items=user_ids,
+            chunk_size=_users_batch_size,
+            max_concurrency=self.max_concurrency
         )
-        users_data = users_response.json()["data"]
+        users_data_by_id = {user_data["id"]: user_data for user_data in users_data}
+        users_data = [users_data_by_id[user_id] for user_id in user_ids if user_id in users_data_by_id]
 
         if expand:
-            return [await self.get_user(user_data["id"]) for user_data in users_data]
+            return await gather_with_concurrency(
+                awaitables=[self.get_user(user_data["id"]) for user_data in users_data],
+                max_concurrency=self.max_concurrency,
+                return_exceptions=return_exceptions
+            )
         else:
             return [
                 PartialUser(client=self, data=user_data)
                 for user_data in users_data
             ]
 
+    async def _get_users_data(self, user_ids: List[int], exclude_banned_users: bool) -> List[dict]:
+        users_response = await self._requests.post(
+            url=self._url_generator.get_url("users", f"v1/users"),
+            json={"userIds": user_ids, "excludeBannedUsers": exclude_banned_users},
+        )
+        return users_response.json()["data"]
+
     async def get_users_by_usernames(
             self,
             usernames: List[str],
             exclude_banned_users: bool = False,
             expand: bool = False,
-    ) -> Union[List[RequestedUsernamePartialUser], List[User]]:
+            return_exceptions: bool = False
+    ) -> Union[List[RequestedUsernamePartialUser], List[User], List[Union[User, Exception]]]:
         """
         Grabs a list of users corresponding to each username in the list.
+        Any amount of usernames can be passed - they are split into multiple requests when needed. Users are returned in
+        the order they were requested in, and invalid usernames are left out.
 
         Arguments:
             usernames: A list of Roblox usernames.
             exclude_banned_users: Whether to exclude banned users from the data.
             expand: Whether to return a list of Users (2 requests) rather than RequestedUsernamePartialUsers (1 request)
+                    Users are expanded concurrently, at most max_concurrency at a time.
+            return_exceptions: When expanding, whether a user that fails to expand is returned as the raised exception
+                               in its place instead of the exception being raised for the whole list.
 
         Returns:
             A list of User or RequestedUsernamePartialUser, depending on the expand argument.
         """
-        users_response = await self._requests.post(
-            url=self._url_generator.get_url("users", f"v1/usernames/users"),
-            json={"usernames": usernames, "excludeBannedUsers": exclude_banned_users},
+        # usernames are case-insensitive, so they are deduplicated and matched up with the results in lowercase
+        usernames = list({username.lower(): username for username in usernames}.values())
+        users_data = await gather_chunks(
+            function=lambda chunk: self._get_users_by_usernames_data(chunk, exclude_banned_users),
+            items=usernames,
+            chunk_size=_usernames_batch_size,
+            max_concurrency=self.max_concurrency
         )
-        users_data = users_response.json()["data"]
+        users_data_by_username = {user_data["requestedUsername"].lower(): user_data for user_data in users_data}
+        users_data = [
+            users_data_by_username[username.lower()] for username in usernames
+            if username.lower() in users_data_by_username
+        ]
 
         if expand:
-            return [await self.get_user(user_data["id"]) for user_data in users_data]
+            return await gather_with_concurrency(
+                awaitables=[self.get_user(user_data["id"]) for user_data in users_data],
+                max_concurrency=self.max_concurrency,
+                return_exceptions=return_exceptions
+            )
         else:
             return [
                 RequestedUsernamePartialUser(client=self, data=user_data)
                 for user_data in users_data
             ]
 
+    async def _get_users_by_usernames_data(self, usernames: List[str], exclude_banned_users: bool) -> List[dict]:
+        users_response = await self._requests.post(
+            url=self._url_generator.get_url("users", f"v1/usernames/users"),
+            json={"usernames": usernames, "excludeBannedUsers": exclude_banned_users},
+        )
+        return users_response.json()["data"]
+
     async def get_user_by_username(
             self, username: str, exclude_banned_users: bool = False, expand: bool = True
     ) -> Union[RequestedUsernamePartialUser, User]:
@@ -231,14 +409,15 @@ class Client:
         """
         return BaseUser(client=self, user_id=user_id)
 
-    def user_search(self, keyword: str, page_size: int = 10,
+    def user_search(self, keyword: str, page_size: Optional[int] = None,
                     max_items: int = None) -> PageIterator:
         """
         Search for users with a keyword.
 
         Arguments:
             keyword: A keyword to search for.
-            page_size: How many members should be returned for each page.
+            page_size: How many members should be returned for each page. None picks the largest size
+                       the endpoint allows.
             max_items: The maximum items to return when looping through this object.
 
         Returns:
@@ -323,6 +502,12 @@ class Client:
         Returns:
             A Universe.
         """
+        if self._universe_batcher:
+            universe = await self._universe_batcher.load(universe_id)
+            if universe is None:
+                raise UniverseNotFound("Invalid universe.")
+            return universe
+
         universes = await self.get_universes(universe_ids=[universe_id])
         try:
             return universes[0]
@@ -377,6 +562,12 @@ class Client:
         Returns:
             A Place.
         """
+        if self._place_batcher:
+            place = await self._place_batcher.load(place_id)
+            if place is None:
+                raise PlaceNotFound("Invalid place.")
+            return place
+
         places = await self.get_places(place_ids=[place_id])
         try:
             return places[0]
@@ -472,6 +663,12 @@ class Client:
         Returns:
             A Plugin.
         """
+        if self._plugin_batcher:
+            plugin = await self._plugin_batcher.load(plugin_id)
+            if plugin is None:
+                raise PluginNotFound("Invalid plugin.")
+            return plugin
+
         plugins = await self.get_plugins([plugin_id])
         try:
             return plugins[0]
@@ -6,21 +6,30 @@ This module contains classes intended to parse and deal with data from Roblox pr
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
 from enum import IntEnum
-from typing import Optional, List
+from typing import AsyncIterator, Dict, Iterable, Optional, List, Tuple
 from typing import TYPE_CHECKING
 
 from dateutil.parser import parse
+from httpx import TransportError
 
 from .bases.basejob import BaseJob
 from .bases.baseplace import BasePlace
 from .bases.baseuniverse import BaseUniverse
+from .utilities.batching import Batcher, gather_chunks
+from .utilities.exceptions import HTTPException
 
 if TYPE_CHECKING:
     from .client import Client
     from .utilities.types import UserOrUserId
 
+_presences_batch_size = 50
+
+# a compact snapshot of a presence: (presence type, place ID, universe ID, job ID)
+PresenceState = Tuple[int, Optional[int], Optional[int], Optional[str]]
+
 
 class PresenceType(IntEnum):
     """
@@ -37,6 +46,7 @@ class Presence:
     Represents a user's presence.
 
     Attributes:
+        user_id: The ID of the user this presence belongs to.
         user_presence_type: The type of the presence.
         last_location: A string representing the user's last location.
         place: The place the user is playing or editing.
@@ -54,6 +64,7 @@ class Presence:
         """
         self._client: Client = client
 
+        self.user_id: int = data["userId"]
         self.user_presence_type: PresenceType = PresenceType(data["userPresenceType"])
         self.last_location: str = data["lastLocation"]
 
@@ -80,6 +91,247 @@ class Presence:
     def __repr__(self):
         return f"<{self.__class__.__name__} user_presence_type={self.user_presence_type}>"
 
+    def _to_state(self) -> PresenceState:
+        return (
+            int(self.user_presence_type),
+            self.place.id if self.place else None,
+            self.universe.id if self.universe else None,
+            self.job.id if self.job else None
+        )
+
+
+class PresenceChange:
+    """
+    Represents a change in a user's presence detected by a PresenceWatcher.
+
+    Attributes:
+        user_id: The ID of the user whose presence changed.
+        presence: The user's new presence.
+        previous_presence_type: The presence type before the change, or None if this is the first time the user was seen.
+        previous_place_id: The ID of the place the user was in before the change.
+        previous_universe_id: The ID of the universe the user was in before the change.
+        previous_job_id: The ID of the job the user was in before the change.
+    """
+
+    def __init__(self, presence: Presence, previous_state: Optional[PresenceState]):
+        """
+        Arguments:
+            presence: The user's new presence.
+            previous_state: The user's previous presence state, or None if this is the first time the user was seen.
+        """
+        self.user_id: int = presence.user_id
+        self.presence: Presence = presence
+
+        previous_presence_type, previous_place_id, previous_universe_id, previous_job_id = \
+            previous_state or (None, None, None, None)
+        self.previous_presence_type: Optional[PresenceType] = PresenceType(previous_presence_type) \
+            if previous_presence_type is not None else None
+        self.previous_place_id: Optional[int] = previous_place_id
+        self.previous_universe_id: Optional[int] = previous_universe_id
+        self.previous_job_id: Optional[str] = previous_job_id
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} user_id={self.user_id} " \
+               f"previous_presence_type={self.previous_presence_type} " \
+               f"user_presence_type={self.presence.user_presence_type}>"
+
+    @property
+    def presence_type_changed(self) -> bool:
+        """
+        Whether the presence type changed, like when a user comes online or joins a game.
+        """
+        return self.previous_presence_type != self.presence.user_presence_type
+
+    @property
+    def universe_changed(self) -> bool:
+        """
+        Whether the user moved to a different universe, or joined or left one.
+        """
+        return self.previous_universe_id != (self.presence.universe.id if self.presence.universe else None)
+
+
+class PresenceWatcher:
+    """
+    Watches the presence of a set of users and yields a PresenceChange whenever a user's presence type, place, universe
+    or job changes. Iterate over it with `async for` to receive changes.
+
+    Users that are online or changed recently are polled every active_interval seconds and the rest every
+    offline_interval seconds, so the amount of requests grows with how active the users are. Users that are due are
+    polled together in chunks of 50, and chunks with room left are filled with the users that are due next.
+    When a poll fails, for example because of a 429 or a server error, the users in it are polled again after a delay
+    that doubles with each failure in a row, from active_interval up to offline_interval.
+
+    Attributes:
+        active_interval: How often, in seconds, users that are online or changed recently are polled.
+        offline_interval: How often, in seconds, offline users are polled.
+        active_window: How long, in seconds, a user keeps being polled as active after their presence changed.
+        emit_initial: Whether the first presence seen for each user is yielded as a change.
+        states: A dictionary mapping each watched user's ID to their last known presence state, a
+                (presence type, place ID, universe ID, job ID) tuple.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            users: Iterable[UserOrUserId],
+            active_interval: float = 5.0,
+            offline_interval: float = 60.0,
+            active_window: float = 300.0,
+            emit_initial: bool = False
+    ):
+        """
+        Arguments:
+            client: Client object.
+            users: The users to watch.
+            active_interval: How often, in seconds, users that are online or changed recently are polled.
+            offline_interval: How often, in seconds, offline users are polled.
+            active_window: How long, in seconds, a user keeps being polled as active after their presence changed.
+            emit_initial: Whether the first presence seen for each user is yielded as a change.
+        """
+        self._client: Client = client
+
+        self.active_interval: float = active_interval
+        self.offline_interval: float = offline_interval
+        self.active_window: float = active_window
+        self.emit_initial: bool = emit_initial
+
+        self.states: Dict[int, PresenceState] = {}
+        self._next_poll: Dict[int, float] = {}
+        self._last_change: Dict[int, float] = {}
+        self._changes: List[PresenceChange] = []
+        self._stopped: bool = False
+        # created when iteration starts, so it belongs to the event loop the watcher runs on
+        self._stop_event: Optional[asyncio.Event] = None
+        self._failures: int = 0
+
+        self.add_users(users)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} users={len(self._next_poll)}>"
+
+    def __aiter__(self) -> AsyncIterator[PresenceChange]:
+        return self._iterate()
+
+    def add_users(self, users: Iterable[UserOrUserId]):
+        """
+        Starts watching more users. They are polled on the next iteration.
+
+        Arguments:
+            users: The users to watch.
+        """
+        for user_id in map(int, users):
+            self._next_poll.setdefault(user_id, 0.0)
+
+    def remove_users(self, users: Iterable[UserOrUserId]):
+        """
+        Stops watching users.
+
+        Arguments:
+            users: The users to stop watching.
+        """
+        for user_id in map(int, users):
+            self._next_poll.pop(user_id, None)
+            self._last_change.pop(user_id, None)
+            self.states.pop(user_id, None)
+
+    def stop(self):
+        """
+        Stops the watcher. Iteration ends once the changes that were already detected have been yielded.
+        """
+        self._stopped = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _get_interval(self, user_id: int, now: float) -> float:
+        state = self.states.get(user_id)
+        if state is not None and state[0] != PresenceType.offline:
+            return self.active_interval
+        last_change = self._last_change.get(user_id)
+        if last_change is not None and now - last_change < self.active_window:
+            return self.active_interval
+        return self.offline_interval
+
+    def _get_due_user_ids(self, now: float) -> List[int]:
+        user_ids = sorted(self._next_poll, key=self._next_poll.__getitem__)
+        due_count = sum(1 for user_id in user_ids if self._next_poll[user_id] <= now)
+        # round the batch up to a full chunk with the users that are due next, the request costs the same
+        batch_count = -(-due_count // _presences_batch_size) * _presences_batch_size
+        return user_ids[:batch_count]
+
+    async def poll(self) -> List[PresenceChange]:
+        """
+        Polls the users that are due now and records their presences.
+
+        Returns:
+            The changes that were detected.
+        """
+        loop = asyncio.get_running_loop()
+        return await self._poll_users(self._get_due_user_ids(loop.time()))
+
+    async def _poll_users(self, user_ids: List[int]) -> List[PresenceChange]:
+        if not user_ids:
+            return []
+
+        presences = await self._client.presence.get_user_presences(user_ids)
+
+        now = asyncio.get_running_loop().time()
+        changes = []
+        for presence in presences:
+            user_id = presence.user_id
+            if user_id not in self._next_poll:
+                # the user was removed while the request was in flight
+                continue
+            state = presence._to_state()
+            previous_state = self.states.get(user_id)
+            if previous_state != state:
+                self.states[user_id] = state
+                if previous_state is not None:
+                    self._last_change[user_id] = now
+                if previous_state is not None or self.emit_initial:
+                    changes.append(PresenceChange(presence=presence, previous_state=previous_state))
+
+        for user_id in user_ids:
+            if user_id in self._next_poll:
+                self._next_poll[user_id] = now + self._get_interval(user_id, now)
+        return changes
+
+    async def _wait(self, delay: float):
+        # returns early when the watcher is stopped
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _iterate(self) -> AsyncIterator[PresenceChange]:
+        loop = asyncio.get_running_loop()
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        while True:
+            while self._changes:
+                yield self._changes.pop(0)
+            if self._stopped or not self._next_poll:
+                return
+
+            delay = min(self._next_poll.values()) - loop.time()
+            if delay > 0:
+                await self._wait(delay)
+                if self._stopped:
+                    return
+
+            user_ids = self._get_due_user_ids(loop.time())
+            try:
+                self._changes += await self._poll_users(user_ids)
+            except (HTTPException, TransportError):
+                # keep watching, but back off the users in the failed poll
+                backoff = min(self.active_interval * 2 ** self._failures, self.offline_interval)
+                self._failures += 1
+                now = loop.time()
+                for user_id in user_ids:
+                    if user_id in self._next_poll:
+                        self._next_poll[user_id] = now + backoff
+            else:
+                self._failures = 0
+
 
 class PresenceProvider:
     """
@@ -90,9 +342,23 @@ class PresenceProvider:
     def __init__(self, client: Client):
         self._client: Client = client
 
+        self._presence_batcher: Optional[Batcher[int, Presence]] = None
+        if client.batch_lookups:
+            self._presence_batcher = Batcher(
+                function=self._get_presences_by_user_id,
+                max_batch_size=_presences_batch_size,
+                delay=client.batch_delay
+            )
+
+    async def _get_presences_by_user_id(self, user_ids: List[int]) -> Dict[int, Presence]:
+        presences = await self.get_user_presences(user_ids)
+        return {presence.user_id: presence for presence in presences}
+
     async def get_user_presences(self, users: List[UserOrUserId]) -> List[Presence]:
         """
         Grabs a list of Presence objects corresponding to each user in the list.
+        Any amount of users can be passed - they are split into multiple requests when needed. Presences are returned
+        in the order the users were passed in.
 
         Arguments:
             users: The list of users you want to get Presences from.
@@ -100,12 +366,73 @@ class PresenceProvider:
         Returns:
             A list of Presences.
         """
+        user_ids = list(dict.fromkeys(map(int, users)))
+        presences_data = await gather_chunks(
+            function=self._get_presences_data,
+            items=user_ids,
+            chunk_size=_presences_batch_size,
+            max_concurrency=self._client.max_concurrency
+        )
+        presences_data_by_id = {presence_data["userId"]: presence_data for presence_data in presences_data}
+        return [
+            Presence(client=self._client, data=presences_data_by_id[user_id])
+            for user_id in user_ids
+            if user_id in presences_data_by_id
+        ]
 
+    async def _get_presences_data(self, user_ids: List[int]) -> List[dict]:
         presences_response = await self._client.requests.post(
             url=self._client.url_generator.get_url("presence", "v1/presence/users"),
             json={
-                "userIds": list(map(int, users))
+                "userIds": user_ids
             }
         )
-        presences_data = presences_response.json()["userPresences"]
-        return [Presence(client=self._client, data=presence_data) for presence_data in presences_data]
+        return presences_response.json()["userPresences"]
+
+    async def get_user_presence(self, user: UserOrUserId) -> Optional[Presence]:
+        """
+        Grabs a user's Presence.
+        If the client was created with batch_lookups enabled, calls made around the same time are combined into a single
+        request.
+
+        Arguments:
+            user: The user you want to get the Presence of.
+
+        Returns:
+            The user's Presence, or None if Roblox didn't return one.
+        """
+        if self._presence_batcher:
+            return await self._presence_batcher.load(int(user))
+
+        presences = await self.get_user_presences([user])
+        return presences[0] if presences else None
+
+    def watch(
+            self,
+            users: Iterable[UserOrUserId],
+            active_interval: float = 5.0,
+            offline_interval: float = 60.0,
+            active_window: float = 300.0,
+            emit_initial: bool = False
+    ) -> PresenceWatcher:
+        """
+        Watches the presence of a set of users.
+
+        Arguments:
+            users: The users to watch.
+            active_interval: How often, in seconds, users that are online or changed recently are polled.
+            offline_interval: How often, in seconds, offline users are polled.
+            active_window: How long, in seconds, a user keeps being polled as active after their presence changed.
+            emit_initial: Whether the first presence seen for each user is yielded as a change.
+
+        Returns:
+            A PresenceWatcher, which yields a PresenceChange whenever a user's presence changes.
+        """
+        return PresenceWatcher(
+            client=self._client,
+            users=users,
+            active_interval=active_interval,
+            offline_interval=offline_interval,
+            active_window=active_window,
+            emit_initial=emit_initial
+        )
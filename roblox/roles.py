@@ -51,13 +51,14 @@ class Role(BaseRole):
     def __repr__(self):
         return f"<{self.__class__.__name__} name={self.name!r} rank={self.rank} member_count={self.member_count}>"
 
-    def get_members(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Ascending,
+    def get_members(self, page_size: Optional[int] = None, sort_order: SortOrder = SortOrder.Ascending,
                     max_items: int = None) -> PageIterator:
         """
         Gets all members with this role.
 
         Arguments:
-            page_size: How many users should be returned for each page.
+            page_size: How many users should be returned for each page. None picks the largest size
+                       the endpoint allows.
             sort_order: Order in which data should be grabbed.
             max_items: The maximum items to return when looping through this object.
 
@@ -9,10 +9,14 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .client import Client
+import asyncio
 from enum import Enum
-from typing import Optional, List, Union, Tuple
+from typing import AsyncIterator, Dict, Optional, List, Union, Tuple, Type
 
+from .bases.baseitem import BaseItem
 from .threedthumbnails import ThreeDThumbnail
+from .utilities.batching import gather_chunks
+from .utilities.cache import CacheBackend
 from .utilities.types import AssetOrAssetId, BadgeOrBadgeId, GamePassOrGamePassId, GroupOrGroupId, PlaceOrPlaceId, \
     UniverseOrUniverseId, UserOrUserId
 
@@ -59,8 +63,27 @@ class AvatarThumbnailType(Enum):
     bust = "bust"
 
 
+class ThumbnailBatchType(Enum):
+    """
+    Type of thumbnail requested from the batch endpoint.
+    """
+
+    asset = "Asset"
+    avatar = "Avatar"
+    avatar_headshot = "AvatarHeadShot"
+    avatar_bust = "AvatarBust"
+    badge_icon = "BadgeIcon"
+    bundle_thumbnail = "BundleThumbnail"
+    game_icon = "GameIcon"
+    game_pass = "GamePass"
+    group_icon = "GroupIcon"
+    outfit = "Outfit"
+
+
 SizeTupleOrString = Union[Tuple[int, int], str]
 
+_thumbnails_batch_size = 100
+
 
 def _to_size_string(size_item: SizeTupleOrString):
     if isinstance(size_item, tuple):
@@ -91,6 +114,9 @@ class Thumbnail:
         self.state: ThumbnailState = ThumbnailState(data["state"])
         self.image_url: Optional[str] = data["imageUrl"]
 
+        # the endpoint and parameters this thumbnail was requested with, used to poll for it again while it is pending
+        self._source: Optional[tuple] = None
+
     def __repr__(self):
         return f"<{self.__class__.__name__} target_id={self.target_id} name={self.state!r} " \
                f"image_url={self.image_url!r}>"
@@ -138,18 +164,291 @@ class UniverseThumbnails:
         ]
 
 
+class ThumbnailBatchRequest:
+    """
+    Represents a single thumbnail request sent as part of a batch with ThumbnailProvider.get_batch_thumbnails.
+
+    Attributes:
+        type: The type of thumbnail.
+        target_id: The ID of the target, like a user ID for avatar thumbnails or a universe ID for game icons.
+        size: The size of the image.
+        image_format: The format of the image.
+        is_circular: Whether the image is a circle.
+    """
+
+    def __init__(
+            self,
+            type: ThumbnailBatchType,
+            target: Union[int, BaseItem],
+            size: SizeTupleOrString = (150, 150),
+            image_format: ThumbnailFormat = ThumbnailFormat.png,
+            is_circular: bool = False,
+    ):
+        """
+        Arguments:
+            type: The type of thumbnail.
+            target: The target, like a user for avatar thumbnails or a universe for game icons.
+            size: The size of the image.
+            image_format: The format of the image.
+            is_circular: Whether the image is a circle.
+        """
+        self.type: ThumbnailBatchType = type
+        self.target_id: int = int(target)
+        self.size: str = _to_size_string(size)
+        self.image_format: ThumbnailFormat = image_format
+        self.is_circular: bool = is_circular
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} type={self.type!r} target_id={self.target_id} size={self.size!r}>"
+
+    def _to_key(self) -> tuple:
+        return self.type, self.target_id, self.size, self.image_format, self.is_circular
+
+
+class _PendingThumbnail:
+    """
+    Tracks a pending thumbnail while it is being re-polled.
+    """
+
+    def __init__(self, thumbnail: Thumbnail):
+        self.thumbnail: Thumbnail = thumbnail
+        self.attempts: int = 0
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+def _is_resolvable(thumbnail: Thumbnail) -> bool:
+    return thumbnail.state == ThumbnailState.pending and thumbnail._source is not None
+
+
+async def _completed(thumbnail: Thumbnail) -> Thumbnail:
+    return thumbnail
+
+
 class ThumbnailProvider:
     """
     The ThumbnailProvider that provides multiple functions for generating user thumbnails.
+    Methods that take a list of targets accept any amount of them - they are split into multiple requests when needed,
+    and thumbnails are returned in the order their targets were passed in.
+
+    Completed thumbnails can be cached, keyed on the target, the kind of thumbnail, the size, the format and whether
+    it is circular. When a list is requested, only the targets without a cached thumbnail are fetched.
+
+    Attributes:
+        cache: The cache backend completed thumbnails are stored in, or None if thumbnails are not cached.
+        cache_ttl: How long, in seconds, completed thumbnails are cached for.
+        pending_poll_delay: How long, in seconds, to wait before re-polling pending thumbnails for the first time.
+        pending_max_poll_delay: The longest delay, in seconds, between two polls. The delay doubles after each poll.
+        pending_max_attempts: How many times a pending thumbnail is re-polled before it is returned as it is.
     """
 
-    def __init__(self, client: Client):
+    def __init__(
+            self,
+            client: Client,
+            cache: Optional[CacheBackend] = None,
+            cache_ttl: Optional[float] = 3600.0
+    ):
         """
         Arguments:
             client: Client object.
+            cache: A cache backend to store completed thumbnails in.
+            cache_ttl: How long, in seconds, completed thumbnails are cached for.
         """
         self._client: Client = client
 
+        self.cache: Optional[CacheBackend] = cache
+        self.cache_ttl: Optional[float] = cache_ttl
+
+        self.pending_poll_delay: float = 1.0
+        self.pending_max_poll_delay: float = 8.0
+        self.pending_max_attempts: int = 10
+
+        # pending thumbnails are grouped by the request that returned them, so each group can be re-polled in batches
+        self._pending: Dict[tuple, Dict[int, _PendingThumbnail]] = {}
+        self._pollers: Dict[tuple, asyncio.Task] = {}
+
+    async def _get_thumbnails_data(self, path: str, ids_name: str, target_ids: List[int], params: dict) -> List[dict]:
+        thumbnails_response = await self._client.requests.get(
+            url=self._client.url_generator.get_url("thumbnails", path),
+            params={
+                ids_name: target_ids,
+                **params
+            },
+        )
+        return thumbnails_response.json()["data"]
+
+    async def _get_thumbnails_data_chunked(
+            self,
+            path: str,
+            ids_name: str,
+            target_ids: List[int],
+            params: dict
+    ) -> List[dict]:
+        return await gather_chunks(
+            function=lambda chunk: self._get_thumbnails_data(path, ids_name, chunk, params),
+            items=target_ids,
+            chunk_size=_thumbnails_batch_size,
+            max_concurrency=self._client.max_concurrency
+        )
+
+    async def _get_thumbnails(
+            self,
+            path: str,
+            ids_name: str,
+            targets: List[Union[int, BaseItem]],
+            params: dict,
+            target_key: str = "targetId",
+            thumbnail_class: Type[Union[Thumbnail, UniverseThumbnails]] = Thumbnail,
+            resolve_pending: bool = False
+    ) -> list:
+        """
+        Fetches thumbnails from a batch endpoint. Targets are deduplicated and split into requests of at most
+        _thumbnails_batch_size IDs, which are sent concurrently. Thumbnails are returned in the order their targets were
+        passed in.
+        If there is a cache, only targets without a cached thumbnail are requested.
+        """
+        target_ids = list(dict.fromkeys(map(int, targets)))
+        source = (path, ids_name, tuple(params.items()))
+        use_cache = self.cache is not None and thumbnail_class is Thumbnail
+
+        thumbnails_data_by_id = {}
+        if use_cache:
+            for target_id in target_ids:
+                thumbnail_data = await self.cache.get(repr((source, target_id)))
+                if thumbnail_data is not None:
+                    thumbnails_data_by_id[target_id] = thumbnail_data
+
+        missing_target_ids = [target_id for target_id in target_ids if target_id not in thumbnails_data_by_id]
+        if missing_target_ids:
+            thumbnails_data = await self._get_thumbnails_data_chunked(path, ids_name, missing_target_ids, params)
+            for thumbnail_data in thumbnails_data:
+                thumbnails_data_by_id[thumbnail_data[target_key]] = thumbnail_data
+                if use_cache:
+                    await self._cache_thumbnail_data(repr((source, thumbnail_data[target_key])), thumbnail_data)
+
+        thumbnails = [
+            thumbnail_class(client=self._client, data=thumbnails_data_by_id[target_id])
+            for target_id in target_ids
+            if target_id in thumbnails_data_by_id
+        ]
+
+        if thumbnail_class is Thumbnail:
+            for thumbnail in thumbnails:
+                thumbnail._source = source
+            if resolve_pending:
+                thumbnails = await self.resolve_pending(thumbnails)
+
+        return thumbnails
+
+    async def _cache_thumbnail_data(self, key: str, thumbnail_data: dict):
+        """
+        Caches thumbnail data if the thumbnail is completed. Other states are temporary or can change, so they are
+        always fetched again.
+        """
+        if thumbnail_data.get("state") == ThumbnailState.completed.value:
+            await self.cache.set(key, thumbnail_data, self.cache_ttl)
+
+    def _wait_for_thumbnail(self, thumbnail: Thumbnail) -> asyncio.Future:
+        """
+        Adds a pending thumbnail to its request's poll group and returns a future for its final version.
+        """
+        pending = self._pending.setdefault(thumbnail._source, {})
+        pending_thumbnail = pending.get(thumbnail.target_id)
+        if pending_thumbnail is None:
+            pending_thumbnail = pending[thumbnail.target_id] = _PendingThumbnail(thumbnail)
+
+        if thumbnail._source not in self._pollers:
+            self._pollers[thumbnail._source] = asyncio.ensure_future(self._poll(thumbnail._source))
+
+        return pending_thumbnail.future
+
+    async def _poll(self, source: tuple):
+        """
+        Re-polls every pending thumbnail in a group in combined batches until they are all final, backing off between
+        polls. Thumbnails that are still pending after pending_max_attempts polls are resolved as they are.
+        """
+        path, ids_name, params = source
+        delay = self.pending_poll_delay
+        try:
+            while self._pending.get(source):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.pending_max_poll_delay)
+
+                pending = self._pending[source]
+                target_ids = list(pending)
+                try:
+                    thumbnails_data = await self._get_thumbnails_data_chunked(path, ids_name, target_ids, dict(params))
+                except Exception as exception:
+                    for target_id in target_ids:
+                        pending_thumbnail = pending.pop(target_id)
+                        if not pending_thumbnail.future.done():
+                            pending_thumbnail.future.set_exception(exception)
+                    continue
+
+                thumbnails_data_by_id = {thumbnail_data["targetId"]: thumbnail_data for thumbnail_data in
+                                         thumbnails_data}
+                for target_id in target_ids:
+                    pending_thumbnail = pending[target_id]
+                    pending_thumbnail.attempts += 1
+                    if target_id in thumbnails_data_by_id:
+                        pending_thumbnail.thumbnail = Thumbnail(
+                            client=self._client,
+                            data=thumbnails_data_by_id[target_id]
+                        )
+                        pending_thumbnail.thumbnail._source = source
+                        if self.cache is not None:
+                            await self._cache_thumbnail_data(
+                                repr((source, target_id)),
+                                thumbnails_data_by_id[target_id]
+                            )
+
+                    if pending_thumbnail.thumbnail.state != ThumbnailState.pending or \
+                            pending_thumbnail.attempts >= self.pending_max_attempts:
+                        del pending[target_id]
+                        if not pending_thumbnail.future.done():
+                            pending_thumbnail.future.set_result(pending_thumbnail.thumbnail)
+        finally:
+            self._pollers.pop(source, None)
+            if not self._pending.get(source):
+                self._pending.pop(source, None)
+
+    async def resolve_pending(self, thumbnails: List[Thumbnail]) -> List[Thumbnail]:
+        """
+        Waits for every pending thumbnail in the list to finish generating.
+        Pending thumbnails from every caller are tracked together and re-polled in combined batches, with a delay that
+        grows between polls.
+
+        Arguments:
+            thumbnails: Thumbnails returned by this provider.
+
+        Returns:
+            The thumbnails in the same order, with pending thumbnails replaced by their final versions.
+        """
+        return list(await asyncio.gather(*[
+            self._wait_for_thumbnail(thumbnail) if _is_resolvable(thumbnail) else _completed(thumbnail)
+            for thumbnail in thumbnails
+        ]))
+
+    async def as_completed(self, thumbnails: List[Thumbnail]) -> AsyncIterator[Thumbnail]:
+        """
+        Yields each thumbnail in the list once it is final. Thumbnails that are not pending are yielded first, and
+        pending thumbnails are yielded as they finish generating.
+
+        Arguments:
+            thumbnails: Thumbnails returned by this provider.
+
+        Returns:
+            An async iterator of final thumbnails.
+        """
+        futures = []
+        for thumbnail in thumbnails:
+            if _is_resolvable(thumbnail):
+                futures.append(self._wait_for_thumbnail(thumbnail))
+            else:
+                yield thumbnail
+
+        for future in asyncio.as_completed([asyncio.shield(future) for future in futures]):
+            yield await future
+
     async def get_asset_thumbnails(
             self,
             assets: List[AssetOrAssetId],
@@ -157,6 +456,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (30, 30),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns asset thumbnails for the asset ID passed.
@@ -191,25 +491,23 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: if the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/assets"),
+        return await self._get_thumbnails(
+            path="v1/assets",
+            ids_name="assetIds",
+            targets=assets,
             params={
-                "assetIds": list(map(int, assets)),
                 "returnPolicy": return_policy.value,
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_asset_thumbnail_3d(self, asset: AssetOrAssetId) -> Thumbnail:
         """
@@ -236,6 +534,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (150, 150),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns badge icons for each badge ID passed.
@@ -247,24 +546,22 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: if the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/badges/icons"),
+        return await self._get_thumbnails(
+            path="v1/badges/icons",
+            ids_name="badgeIds",
+            targets=badges,
             params={
-                "badgeIds": list(map(int, badges)),
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_gamepass_icons(
             self,
@@ -273,6 +570,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (150, 150),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns gamepass icons for each gamepass ID passed.
@@ -284,24 +582,22 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: If the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/game-passes"),
+        return await self._get_thumbnails(
+            path="v1/game-passes",
+            ids_name="gamePassIds",
+            targets=gamepasses,
             params={
-                "gamePassIds": list(map(int, gamepasses)),
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_universe_icons(
             self,
@@ -310,6 +606,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (50, 50),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns universe icons for each universe ID passed.
@@ -327,25 +624,23 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: If the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/games/icons"),
+        return await self._get_thumbnails(
+            path="v1/games/icons",
+            ids_name="universeIds",
+            targets=universes,
             params={
-                "universeIds": list(map(int, universes)),
                 "returnPolicy": return_policy.value,
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_universe_thumbnails(
             self,
@@ -376,24 +671,20 @@ class ThumbnailProvider:
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url(
-                "thumbnails", "v1/games/multiget/thumbnails"
-            ),
+        return await self._get_thumbnails(
+            path="v1/games/multiget/thumbnails",
+            ids_name="universeIds",
+            targets=universes,
             params={
-                "universeIds": list(map(int, universes)),
                 "countPerUniverse": count_per_universe,
                 "defaults": defaults,
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            target_key="universeId",
+            thumbnail_class=UniverseThumbnails,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            UniverseThumbnails(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_group_icons(
             self,
@@ -401,6 +692,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (150, 150),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns icons for each group ID passed.
@@ -413,24 +705,22 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: If the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/groups/icons"),
+        return await self._get_thumbnails(
+            path="v1/groups/icons",
+            ids_name="groupIds",
+            targets=groups,
             params={
-                "groupIds": list(map(int, groups)),
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_place_icons(
             self,
@@ -439,6 +729,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = (50, 50),
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns icons for each place ID passed.
@@ -456,24 +747,22 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: if the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
         Returns:
             A List of Thumbnails.
         """
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", "v1/places/gameicons"),
+        return await self._get_thumbnails(
+            path="v1/places/gameicons",
+            ids_name="placeIds",
+            targets=places,
             params={
-                "placeIds": list(map(int, places)),
                 "returnPolicy": return_policy.value,
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
-        thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
 
     async def get_user_avatar_thumbnails(
             self,
@@ -482,6 +771,7 @@ class ThumbnailProvider:
             size: SizeTupleOrString = None,
             image_format: ThumbnailFormat = ThumbnailFormat.png,
             is_circular: bool = False,
+            resolve_pending: bool = False,
     ) -> List[Thumbnail]:
         """
         Returns avatar thumbnails for each user ID passed.
@@ -511,6 +801,7 @@ class ThumbnailProvider:
             size: size of the image.
             image_format: Format of the image.
             is_circular: If the image is a circle yes or no.
+            resolve_pending: Whether to wait for pending thumbnails to finish generating before returning.
 
         Returns:
             A list of Thumbnails.
@@ -528,21 +819,86 @@ class ThumbnailProvider:
         else:
             raise ValueError("Avatar type is invalid.")
 
-        thumbnails_response = await self._client.requests.get(
-            url=self._client.url_generator.get_url("thumbnails", f"v1/users/{uri}"),
+        return await self._get_thumbnails(
+            path=f"v1/users/{uri}",
+            ids_name="userIds",
+            targets=users,
             params={
-                "userIds": list(map(int, users)),
                 "size": _to_size_string(size),
                 "format": image_format.value,
                 "isCircular": is_circular,
             },
+            resolve_pending=resolve_pending,
         )
 
+    async def _get_batch_thumbnails_data(self, requests: List[ThumbnailBatchRequest]) -> List[dict]:
+        thumbnails_response = await self._client.requests.post(
+            url=self._client.url_generator.get_url("thumbnails", "v1/batch"),
+            json=[
+                {
+                    "requestId": str(index),
+                    "type": request.type.value,
+                    "targetId": request.target_id,
+                    "size": request.size,
+                    "format": request.image_format.value,
+                    "isCircular": request.is_circular,
+                } for index, request in enumerate(requests)
+            ]
+        )
         thumbnails_data = thumbnails_response.json()["data"]
-        return [
-            Thumbnail(client=self._client, data=thumbnail_data)
-            for thumbnail_data in thumbnails_data
-        ]
+        # put the data back in request order so the results line up with the requests across chunks
+        thumbnails_data_by_request_id = {thumbnail_data["requestId"]: thumbnail_data for thumbnail_data in
+                                         thumbnails_data}
+        return [thumbnails_data_by_request_id.get(str(index)) for index in range(len(requests))]
+
+    async def get_batch_thumbnails(
+            self,
+            requests: List[ThumbnailBatchRequest]
+    ) -> Dict[ThumbnailBatchRequest, Thumbnail]:
+        """
+        Returns thumbnails of different types at once, like avatars, game icons and group icons for a single page,
+        using the batch endpoint. Requests are packed into as few requests as possible, and identical requests are only
+        sent once.
+
+        Arguments:
+            requests: The thumbnails you want.
+
+        Returns:
+            A dictionary mapping each request to its Thumbnail. Requests Roblox didn't return a thumbnail for are left out.
+        """
+        unique_requests = list({request._to_key(): request for request in requests}.values())
+
+        thumbnails_data_by_key = {}
+        if self.cache is not None:
+            for request in unique_requests:
+                thumbnail_data = await self.cache.get(repr(("v1/batch", request._to_key())))
+                if thumbnail_data is not None:
+                    thumbnails_data_by_key[request._to_key()] = thumbnail_data
+
+        missing_requests = [request for request in unique_requests if request._to_key() not in thumbnails_data_by_key]
+        if missing_requests:
+            thumbnails_data = await gather_chunks(
+                function=self._get_batch_thumbnails_data,
+                items=missing_requests,
+                chunk_size=_thumbnails_batch_size,
+                max_concurrency=self._client.max_concurrency
+            )
+            for request, thumbnail_data in zip(missing_requests, thumbnails_data):
+                if thumbnail_data is None:
+                    continue
+                thumbnails_data_by_key[request._to_key()] = thumbnail_data
+                if self.cache is not None:
+                    await self._cache_thumbnail_data(repr(("v1/batch", request._to_key())), thumbnail_data)
+
+        thumbnails_by_key = {
+            key: Thumbnail(client=self._client, data=thumbnail_data)
+            for key, thumbnail_data in thumbnails_data_by_key.items()
+        }
+        return {
+            request: thumbnails_by_key[request._to_key()]
+            for request in requests
+            if request._to_key() in thumbnails_by_key
+        }
 
     async def get_user_avatar_thumbnail_3d(self, user: UserOrUserId) -> Thumbnail:
         """
@@ -0,0 +1,173 @@
+"""
+
+This module contains functions and objects used internally by ro.py to split large batch requests into smaller ones, to
+run requests concurrently and to combine single lookups into batch requests.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Set, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def chunk_list(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """
+    Splits a sequence into chunks of at most the passed size.
+
+    Arguments:
+        items: The items to split.
+        size: The maximum size of each chunk.
+
+    Returns:
+        A list of chunks.
+    """
+    return [items[index:index + size] for index in range(0, len(items), size)]
+
+
+async def gather_chunks(
+        function: Callable[[Sequence[T]], Awaitable[List[R]]],
+        items: Sequence[T],
+        chunk_size: int,
+        max_concurrency: int
+) -> List[R]:
+    """
+    Splits the items into chunks and calls the function with each chunk, running at most max_concurrency calls at once.
+
+    Arguments:
+        function: An async function that takes a chunk of items and returns a list of results.
+        items: The items to split.
+        chunk_size: The maximum amount of items passed to the function at once.
+        max_concurrency: The maximum amount of concurrent calls.
+
+    Returns:
+        The results of every call, concatenated in chunk order.
+    """
+    chunks = chunk_list(items, chunk_size)
+    if len(chunks) == 1:
+        return await function(chunks[0])
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(chunk: Sequence[T]) -> List[R]:
+        async with semaphore:
+            return await function(chunk)
+
+    results: List[R] = []
+    for chunk_results in await asyncio.gather(*[run(chunk) for chunk in chunks]):
+        results += chunk_results
+    return results
+
+
+async def gather_with_concurrency(
+        awaitables: Iterable[Awaitable[R]],
+        max_concurrency: int,
+        return_exceptions: bool = False
+) -> list:
+    """
+    Like asyncio.gather, but runs at most max_concurrency awaitables at once.
+
+    Arguments:
+        awaitables: The awaitables to run.
+        max_concurrency: The maximum amount of awaitables running at once.
+        return_exceptions: Whether exceptions are returned in place of results instead of being raised.
+
+    Returns:
+        The results, in the same order as the awaitables.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(awaitable: Awaitable[R]) -> R:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*[run(awaitable) for awaitable in awaitables], return_exceptions=return_exceptions)
+
+
+class Batcher(Generic[K, V]):
+    """
+    Collects single-key lookups made by independent callers within a short window and resolves all of them with one
+    batch request, like a DataLoader. A batch is sent once max_batch_size different keys have been requested or delay
+    seconds have passed since the first one, whichever comes first.
+
+    Attributes:
+        function: An async function that takes a list of keys and returns a dictionary mapping keys to values.
+        max_batch_size: The maximum amount of keys passed to the function at once.
+        delay: How long, in seconds, to wait for more keys before sending a batch.
+    """
+
+    def __init__(
+            self,
+            function: Callable[[List[K]], Awaitable[Dict[K, V]]],
+            max_batch_size: int = 50,
+            delay: float = 0.01
+    ):
+        """
+        Arguments:
+            function: An async function that takes a list of keys and returns a dictionary mapping keys to values.
+            max_batch_size: The maximum amount of keys passed to the function at once.
+            delay: How long, in seconds, to wait for more keys before sending a batch.
+        """
+        self.function: Callable[[List[K]], Awaitable[Dict[K, V]]] = function
+        self.max_batch_size: int = max_batch_size
+        self.delay: float = delay
+
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # the event loop only keeps weak references to tasks, so running batches are kept here until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} max_batch_size={self.max_batch_size} delay={self.delay}>"
+
+    async def load(self, key: K) -> Optional[V]:
+        """
+        Adds a key to the next batch and waits for its value.
+
+        Arguments:
+            key: The key.
+
+        Returns:
+            The key's value, or None if the batch function did not return one.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.delay, self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[K, asyncio.Future]):
+        try:
+            values = await self.function(list(pending))
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as exception:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exception)
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(values.get(key))
@@ -0,0 +1,385 @@
+"""
+
+This module contains the response cache used by ro.py and the storage backends it can be used with.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from httpx import Request, Response, URL
+
+# The stored content is already decoded, so these headers would no longer describe it.
+_uncached_headers = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CacheBackend:
+    """
+    Represents a key-value store the cache can keep its entries in.
+    Subclass this and implement every method to plug in your own store. Keys are strings and values are picklable
+    Python objects.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the value stored under the key, or None if there is no value or it has expired.
+
+        Arguments:
+            key: The key.
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a value under the key.
+
+        Arguments:
+            key: The key.
+            value: The value.
+            ttl: How long, in seconds, the value should be kept. None means until it is evicted.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """
+        Removes the value stored under the key, if there is one.
+
+        Arguments:
+            key: The key.
+        """
+        raise NotImplementedError
+
+    async def clear(self):
+        """
+        Removes every value.
+        """
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    An in-memory cache backend that evicts the least recently used entries once it is full.
+
+    Attributes:
+        max_size: The maximum amount of entries. None means no limit.
+    """
+
+    def __init__(self, max_size: Optional[int] = 1024):
+        """
+        Arguments:
+            max_size: The maximum amount of entries. None means no limit.
+        """
+        self.max_size: Optional[int] = max_size
+        self._entries: OrderedDict[str, Tuple[Optional[float], Any]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            expires, value = self._entries[key]
+        except KeyError:
+            return None
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    An on-disk cache backend stored in a SQLite database, which survives restarts and can be shared between processes.
+    It evicts the least recently used entries once it is full.
+
+    Database calls run on a background thread, so a slow disk or another process holding a lock never blocks the
+    event loop. Access times are recorded in memory and written in batches, and once the table grows past max_size the
+    oldest entries are evicted in one go until it is back to 90% of max_size.
+
+    Attributes:
+        path: The path to the database file.
+        max_size: The maximum amount of entries. None means no limit.
+        access_batch_size: How many access times are collected before they are written to the database.
+    """
+
+    def __init__(self, path: str, max_size: Optional[int] = 100_000, access_batch_size: int = 100):
+        """
+        Arguments:
+            path: The path to the database file. It is created if it doesn't exist.
+            max_size: The maximum amount of entries. None means no limit.
+            access_batch_size: How many access times are collected before they are written to the database.
+        """
+        self.path: str = path
+        self.max_size: Optional[int] = max_size
+        self.access_batch_size: int = access_batch_size
+
+        # a single thread owns the connection, which also keeps database calls in order
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._connection: sqlite3.Connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._size: int = self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        self._accessed: Dict[str, float] = {}
+
+    def close(self):
+        """
+        Closes the database connection. Access times that weren't written yet are lost.
+        """
+        self._executor.shutdown(wait=True)
+        self._connection.close()
+
+    async def _run(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        row = self._connection.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires <= now:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        return pickle.loads(value)
+
+    def _write_accessed(self, accessed: Dict[str, float]):
+        self._connection.executemany(
+            "UPDATE cache SET accessed = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in accessed.items()]
+        )
+
+    def _set(self, key: str, value: bytes, expires: Optional[float], now: float, accessed: Dict[str, float]):
+        if accessed:
+            self._write_accessed(accessed)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, expires, now)
+        )
+        if self.max_size is not None and self._size > self.max_size:
+            # other processes may have changed the table, so count it before evicting
+            self._size = self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if self._size > self.max_size:
+                target = int(self.max_size * 0.9)
+                self._connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed ASC LIMIT ?)",
+                    (self._size - target,)
+                )
+                self._size = target
+
+    def _take_accessed(self) -> Dict[str, float]:
+        accessed, self._accessed = self._accessed, {}
+        return accessed
+
+    async def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        value = await self._run(self._get, key, now)
+        if value is not None:
+            self._accessed[key] = now
+            if len(self._accessed) >= self.access_batch_size:
+                await self._run(self._write_accessed, self._take_accessed())
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        self._size += 1
+        self._accessed.pop(key, None)
+        await self._run(
+            self._set, key, pickle.dumps(value), now + ttl if ttl is not None else None, now, self._take_accessed()
+        )
+
+    async def delete(self, key: str):
+        self._accessed.pop(key, None)
+        await self._run(self._connection.execute, "DELETE FROM cache WHERE key = ?", (key,))
+
+    async def clear(self):
+        self._accessed.clear()
+        self._size = 0
+        await self._run(self._connection.execute, "DELETE FROM cache")
+
+
+class ResponseCache:
+    """
+    Caches successful GET responses for a time that can be configured per endpoint.
+
+    Endpoints are matched with shell-style patterns against the request's host and path, like
+    `"games.roblox.com/v1/games*"` or `"*.roblox.com/v1/users/*"`. The first matching pattern wins and endpoints that
+    don't match any pattern use default_ttl. A TTL of None disables caching for those endpoints.
+
+    When revalidation is enabled, responses with an ETag or Last-Modified header are kept after their TTL runs out.
+    The next request for them is sent with If-None-Match/If-Modified-Since, and if Roblox answers with
+    304 Not Modified the cached body is returned and its TTL starts again. A TTL of 0 revalidates on every request.
+
+    Responses are stored per account: requests sent with a different .ROBLOSECURITY token, or without one, never get
+    each other's responses.
+
+    Attributes:
+        backend: The backend entries are stored in.
+        default_ttl: The TTL, in seconds, for endpoints without a matching pattern in ttls.
+        ttls: A dictionary mapping endpoint patterns to TTLs in seconds.
+        revalidate: Whether to revalidate stale responses with conditional requests.
+        stale_ttl: How long, in seconds, stale responses are kept for revalidation.
+    """
+
+    def __init__(
+            self,
+            backend: Optional[CacheBackend] = None,
+            default_ttl: Optional[float] = 60.0,
+            ttls: Optional[Dict[str, Optional[float]]] = None,
+            revalidate: bool = True,
+            stale_ttl: Optional[float] = 86400.0
+    ):
+        """
+        Arguments:
+            backend: The backend to store entries in. Defaults to a MemoryCacheBackend.
+            default_ttl: The TTL, in seconds, for endpoints without a matching pattern in ttls.
+            ttls: A dictionary mapping endpoint patterns to TTLs in seconds.
+            revalidate: Whether to revalidate stale responses with conditional requests.
+            stale_ttl: How long, in seconds, stale responses are kept for revalidation. None means until evicted.
+        """
+        self.backend: CacheBackend = backend if backend is not None else MemoryCacheBackend()
+        self.default_ttl: Optional[float] = default_ttl
+        self.ttls: Dict[str, Optional[float]] = ttls or {}
+        self.revalidate: bool = revalidate
+        self.stale_ttl: Optional[float] = stale_ttl
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} backend={self.backend!r} default_ttl={self.default_ttl}>"
+
+    def get_ttl(self, url: Union[str, URL]) -> Optional[float]:
+        """
+        Returns the TTL for the passed URL.
+
+        Arguments:
+            url: The request URL.
+        """
+        url = URL(url)
+        endpoint = f"{url.host}{url.path}"
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def _to_response(entry: dict) -> Response:
+        return Response(
+            status_code=entry["status_code"],
+            headers=entry["headers"],
+            content=entry["content"],
+            request=Request("GET", entry["url"])
+        )
+
+    async def lookup(self, key: Tuple) -> Tuple[Optional[Response], Dict[str, str]]:
+        """
+        Looks up the cached response for a request key.
+
+        Arguments:
+            key: The request key.
+
+        Returns:
+            The cached response if there is a fresh one, and otherwise the conditional headers to send with the request
+            so a stale response can be revalidated.
+        """
+        entry = await self.backend.get(repr(key))
+        if entry is None:
+            return None, {}
+        if entry["expires"] > time.time():
+            return self._to_response(entry), {}
+
+        headers = {}
+        if self.revalidate:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return None, headers
+
+    async def get(self, key: Tuple) -> Optional[Response]:
+        """
+        Returns the cached response for a request key, or None if there isn't a fresh one.
+
+        Arguments:
+            key: The request key.
+        """
+        response, _ = await self.lookup(key)
+        return response
+
+    async def store(self, key: Tuple, response: Response) -> Optional[Response]:
+        """
+        Stores a response under a request key if it is cacheable.
+        If the response is a 304 Not Modified answer to a conditional request, the stored response is refreshed instead.
+
+        Arguments:
+            key: The request key.
+            response: The response.
+
+        Returns:
+            The response that should be returned to the caller, or None if the response is a 304 but the stored
+            response is gone (for example because it was evicted while the request was sent), in which case the
+            request has to be sent again without conditional headers.
+        """
+        ttl = self.get_ttl(response.url)
+
+        if response.status_code == 304:
+            entry = await self.backend.get(repr(key))
+            if entry is None or ttl is None:
+                return None
+            entry["expires"] = time.time() + ttl
+            await self.backend.set(repr(key), entry, self._get_storage_ttl(ttl, entry))
+            return self._to_response(entry)
+
+        if ttl is None or response.status_code != 200:
+            return response
+
+        entry = {
+            "status_code": response.status_code,
+            "headers": [
+                (name, value) for name, value in response.headers.multi_items()
+                if name.lower() not in _uncached_headers
+            ],
+            "content": response.content,
+            "url": str(response.url),
+            "expires": time.time() + ttl,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        storage_ttl = self._get_storage_ttl(ttl, entry)
+        if storage_ttl is None or storage_ttl > 0:
+            await self.backend.set(repr(key), entry, storage_ttl)
+        return response
+
+    def _get_storage_ttl(self, ttl: float, entry: dict) -> Optional[float]:
+        """
+        Returns how long an entry should be kept in the backend. Entries that can be revalidated outlive their TTL.
+        """
+        if self.revalidate and (entry["etag"] or entry["last_modified"]):
+            return None if self.stale_ttl is None else ttl + self.stale_ttl
+        return ttl
+
+    async def clear(self):
+        """
+        Removes every cached response.
+        """
+        await self.backend.clear()
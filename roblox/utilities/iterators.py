@@ -10,10 +10,34 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..client import Client
 
+import asyncio
+import json
+import os
+import re
+from array import array
 from enum import Enum
-from typing import Callable, Optional, AsyncIterator
+from typing import Any, Callable, Dict, Iterable, List, Optional, AsyncIterator, Sequence, Tuple, Union
 
-from .exceptions import NoMoreItems
+from .exceptions import BadRequest, NoMoreItems
+from .ratelimit import TokenBucket
+from .sinks import Sink
+
+
+# the page sizes Roblox accepts on cursor-based endpoints
+_page_sizes = (10, 25, 50, 100)
+
+
+def _get_endpoint_key(url: str) -> str:
+    # IDs in the path don't change which page sizes an endpoint accepts
+    return re.sub(r"/\d+(?=/|$)", "/{id}", url)
+
+
+def _is_limit_error(exception: BadRequest) -> bool:
+    # Roblox reports rejected page sizes either with the limit field or with a message mentioning it
+    return any(
+        (error.field or "").lower() == "limit" or "limit" in (error.message or "").lower()
+        for error in exception.errors
+    )
 
 
 class SortOrder(Enum):
@@ -28,14 +52,18 @@ class SortOrder(Enum):
 class IteratorItems(AsyncIterator):
     """
     Represents the items inside of an iterator.
+    When reversed, pages are walked backwards from the current page and the items of each page are returned last to
+    first.
     """
 
-    def __init__(self, iterator: RobloxIterator, max_items: Optional[int] = None):
+    def __init__(self, iterator: RobloxIterator, max_items: Optional[int] = None, reverse: bool = False):
         self._iterator = iterator
         self._position: int = 0
         self._global_position: int = 0
         self._items: list = []
         self._max_items = max_items
+        self._reverse: bool = reverse
+        self._iterator._start_pass(max_items)
 
     def __aiter__(self):
         self._position = 0
@@ -43,12 +71,20 @@ class IteratorItems(AsyncIterator):
         return self
 
     async def __anext__(self):
+        if self._max_items is not None and self._global_position >= self._max_items:
+            # stop fetching pages ahead, we won't need them
+            await self._iterator.aclose()
+            raise StopAsyncIteration
+
         if self._position == len(self._items):
             # we are at the end of our current page of items. start again with a new page
             self._position = 0
             try:
                 # get new items
-                self._items = await self._iterator.next()
+                if self._reverse:
+                    self._items = (await self._iterator.prev())[::-1]
+                else:
+                    self._items = await self._iterator.next()
             except NoMoreItems:
                 # if there aren't any more items, reset and break the loop
                 self._position = 0
@@ -56,9 +92,6 @@ class IteratorItems(AsyncIterator):
                 self._items = []
                 raise StopAsyncIteration
 
-        if self._max_items is not None and self._global_position >= self._max_items:
-            raise StopAsyncIteration
-
         # if we got here we know there are more items
         try:
             item = self._items[self._position]
@@ -74,17 +107,22 @@ class IteratorItems(AsyncIterator):
 class IteratorPages(AsyncIterator):
     """
     Represents the pages inside of an iterator.
+    When reversed, pages are walked backwards from the current page.
     """
 
-    def __init__(self, iterator: RobloxIterator):
+    def __init__(self, iterator: RobloxIterator, reverse: bool = False):
         self._iterator = iterator
+        self._reverse: bool = reverse
 
     def __aiter__(self):
         return self
 
     async def __anext__(self):
         try:
-            page = await self._iterator.next()
+            if self._reverse:
+                page = await self._iterator.prev()
+            else:
+                page = await self._iterator.next()
             return page
         except NoMoreItems:
             raise StopAsyncIteration
@@ -93,10 +131,101 @@ class IteratorPages(AsyncIterator):
 class RobloxIterator:
     """
     Represents a basic iterator which all iterators should implement.
+
+    Attributes:
+        max_items: The maximum amount of items to return when this iterator is looped through.
+        prefetch: How many pages to download ahead of the page being processed. 0 disables prefetching. Not every
+                  iterator supports prefetching.
+        raw: Whether items are returned as the dictionaries sent by Roblox instead of being passed to the handler.
+        fields: Dotted paths of the only fields to return from each item, like "user.userId". A single field returns
+                its value for each item, and several fields return a tuple of values. The handler is skipped.
+        typecode: An array typecode, like "q", to return each page as an array.array of the values of the single
+                  field in fields.
     """
 
-    def __init__(self, max_items: int = None):
+    def __init__(
+            self,
+            max_items: int = None,
+            prefetch: int = 0,
+            raw: bool = False,
+            fields: Optional[Sequence[str]] = None,
+            typecode: Optional[str] = None
+    ):
         self.max_items: Optional[int] = max_items
+        self.prefetch: int = prefetch
+        self.raw: bool = raw
+        # the max_items of the current loop or flatten call and how many items it has received, used to size pages
+        self._pass_max_items: Optional[int] = max_items
+        self._pass_items: int = 0
+        self.fields: Optional[Tuple[str, ...]] = None
+        self.typecode: Optional[str] = None
+        self._field_paths: List[List[str]] = []
+        if fields is not None:
+            self.project(*fields, typecode=typecode)
+
+    def project(self, *fields: str, typecode: Optional[str] = None) -> RobloxIterator:
+        """
+        Makes the iterator return only some fields of each item instead of parsed objects, which skips building
+        objects for data that isn't needed.
+
+        Arguments:
+            *fields: Dotted paths of the fields to return, like "user.userId". A single field returns its value for
+                     each item, and several fields return a tuple of values. Missing fields are None.
+            typecode: An array typecode, like "q", to return each page as an array.array of the values of the single
+                      field passed.
+
+        Returns:
+            This iterator.
+        """
+        if typecode is not None and len(fields) != 1:
+            raise ValueError("A typecode can only be used with a single field.")
+        self.fields = fields or None
+        self.typecode = typecode
+        self._field_paths = [field.split(".") for field in fields]
+        return self
+
+    @staticmethod
+    def _get_field(item_data: Any, path: List[str]) -> Any:
+        for key in path:
+            if not isinstance(item_data, dict):
+                return None
+            item_data = item_data.get(key)
+        return item_data
+
+    def _handle_page(self, data: list) -> Union[list, array]:
+        """
+        Turns the raw items of a page into the items the iterator returns.
+        """
+        if self.fields:
+            if len(self._field_paths) == 1:
+                path = self._field_paths[0]
+                values = [self._get_field(item_data, path) for item_data in data]
+                return array(self.typecode, values) if self.typecode else values
+            return [
+                tuple(self._get_field(item_data, path) for path in self._field_paths)
+                for item_data in data
+            ]
+
+        if self.raw or not self.handler:
+            return data
+
+        return [
+            self.handler(
+                client=self._client,
+                data=item_data,
+                **self.handler_kwargs
+            ) for item_data in data
+        ]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def _start_pass(self, max_items: Optional[int]):
+        self._pass_max_items = max_items
+        self._pass_items = 0
 
     async def next(self):
         """
@@ -105,6 +234,21 @@ class RobloxIterator:
 
         raise NotImplementedError
 
+    async def prev(self):
+        """
+        Moves to the page before the last page that was returned and returns that page's data.
+        Not every iterator can go backwards.
+        """
+
+        raise NotImplementedError
+
+    async def aclose(self):
+        """
+        Stops downloading pages ahead and discards the pages that were downloaded but not returned yet.
+        The iterator can still be used afterwards, it continues after the last page it returned.
+        """
+        pass
+
     async def flatten(self, max_items: int = None) -> list:
         """
         Flattens the data into a list.
@@ -112,19 +256,42 @@ class RobloxIterator:
         if max_items is None:
             max_items = self.max_items
 
+        self._start_pass(max_items)
         items: list = []
 
-        while True:
+        while max_items is None or len(items) < max_items:
             try:
                 new_items = await self.next()
-                items += new_items
             except NoMoreItems:
                 break
 
-            if max_items is not None and len(items) >= max_items:
-                break
+            if max_items is not None:
+                new_items = new_items[:max_items - len(items)]
+            items += new_items
 
-        return items[:max_items]
+        await self.aclose()
+        return items
+
+    async def export(self, sink: Sink, max_items: int = None) -> int:
+        """
+        Writes every item to a sink as it arrives, without keeping the items in memory.
+        The sink is flushed at the end but not closed.
+
+        Arguments:
+            sink: The sink to write to, like an NDJSONSink or a CSVSink.
+            max_items: The maximum amount of items to write.
+
+        Returns:
+            The amount of items written.
+        """
+        count = 0
+        try:
+            async for item in self.items(max_items=max_items):
+                sink.write(item)
+                count += 1
+        finally:
+            sink.flush()
+        return count
 
     def __aiter__(self):
         return IteratorItems(
@@ -132,22 +299,36 @@ class RobloxIterator:
             max_items=self.max_items
         )
 
-    def items(self, max_items: int = None) -> IteratorItems:
+    def items(self, max_items: int = None, prefetch: int = None, reverse: bool = False) -> IteratorItems:
         """
         Returns an AsyncIterable containing each iterator item.
+
+        Arguments:
+            max_items: The maximum amount of items to return.
+            prefetch: How many pages to download ahead of the page being processed. Defaults to the prefetch attribute.
+            reverse: Whether to walk backwards from the current page, returning items last to first.
         """
         if max_items is None:
             max_items = self.max_items
+        if prefetch is not None:
+            self.prefetch = prefetch
         return IteratorItems(
             iterator=self,
-            max_items=max_items
+            max_items=max_items,
+            reverse=reverse
         )
 
-    def pages(self) -> IteratorPages:
+    def pages(self, prefetch: int = None, reverse: bool = False) -> IteratorPages:
         """
         Returns an AsyncIterable containing each iterator page. Each page is a list of items.
+
+        Arguments:
+            prefetch: How many pages to download ahead of the page being processed. Defaults to the prefetch attribute.
+            reverse: Whether to walk backwards from the current page.
         """
-        return IteratorPages(self)
+        if prefetch is not None:
+            self.prefetch = prefetch
+        return IteratorPages(self, reverse=reverse)
 
 
 class PageIterator(RobloxIterator):
@@ -160,46 +341,73 @@ class PageIterator(RobloxIterator):
         _client: The Client.
         url: The endpoint to hit for new page data.
         sort_order: The sort order to use for returned data.
-        page_size: How much data should be returned per-page.
+        page_size: How much data should be returned per-page. None picks the largest size the endpoint allows, and a
+                   smaller one for the last page when max_items only needs a few more items.
         extra_parameters: Extra parameters to pass to the endpoint.
         handler: A callable object to use to convert raw endpoint data to parsed objects.
         handler_kwargs: Extra keyword arguments to pass to the handler.
         next_cursor: Cursor to use to advance to the next page.
         previous_cursor: Cursor to use to advance to the previous page.
+        prefetch: How many pages to download ahead of the page being processed. 0 disables prefetching.
+        items_yielded: How many items the iterator has returned so far.
+        checkpoint_path: A JSON file the iterator's state is saved to while it runs, or None to not save it.
+        checkpoint_interval: How many pages are returned between two saves of the state.
         iterator_position: What position in the iterator_items the iterator is currently at.
         iterator_items: List of current items the iterator is working on.
     """
 
+    # the largest page size that worked on each endpoint that rejected a larger one
+    _max_page_sizes: Dict[str, int] = {}
+    # the largest page size each endpoint accepted, which is never probed again
+    _working_page_sizes: Dict[str, int] = {}
+
     def __init__(
             self,
             client: Client,
             url: str,
             sort_order: SortOrder = SortOrder.Ascending,
-            page_size: int = 10,
+            page_size: Optional[int] = None,
             max_items: int = None,
             extra_parameters: Optional[dict] = None,
             handler: Optional[Callable] = None,
-            handler_kwargs: Optional[dict] = None
+            handler_kwargs: Optional[dict] = None,
+            prefetch: int = 0,
+            checkpoint_path: Optional[str] = None,
+            checkpoint_interval: int = 10,
+            raw: bool = False,
+            fields: Optional[Sequence[str]] = None,
+            typecode: Optional[str] = None
     ):
         """
         Parameters:
             client: The Client.
             url: The endpoint to hit for new page data.
             sort_order: The sort order to use for returned data.
-            page_size: How much data should be returned per-page.
+            page_size: How much data should be returned per-page. None picks the largest size the endpoint allows,
+                       and a smaller one for the last page when max_items only needs a few more items. Sizes the
+                       endpoint rejects with a limit error are remembered for later iterators, and sizes that
+                       worked once are never probed again.
             max_items: The maximum amount of items to return when this iterator is looped through.
             extra_parameters: Extra parameters to pass to the endpoint.
             handler: A callable object to use to convert raw endpoint data to parsed objects.
             handler_kwargs: Extra keyword arguments to pass to the handler.
+            prefetch: How many pages to download ahead of the page being processed. Pages are downloaded in the
+                      background while the current page is processed, and at most this many are kept waiting.
+            checkpoint_path: A JSON file to save the iterator's state to while it runs. Pass the state back to
+                             from_state to resume after a crash.
+            checkpoint_interval: How many pages are returned between two saves of the state.
+            raw: Whether to return the dictionaries sent by Roblox instead of passing them to the handler.
+            fields: Dotted paths of the only fields to return from each item, like "user.userId".
+            typecode: An array typecode, like "q", to return each page as an array.array of a single field's values.
         """
-        super().__init__(max_items=max_items)
+        super().__init__(max_items=max_items, prefetch=prefetch, raw=raw, fields=fields, typecode=typecode)
 
         self._client: Client = client
 
         # store some basic arguments in the object
         self.url: str = url
         self.sort_order: SortOrder = sort_order
-        self.page_size: int = page_size
+        self.page_size: Optional[int] = page_size
 
         self.extra_parameters: dict = extra_parameters or {}
         self.handler: Callable = handler
@@ -214,53 +422,339 @@ class PageIterator(RobloxIterator):
         self.iterator_items: list = []
         self.next_started: bool = False
 
+        self.items_yielded: int = 0
+        self.checkpoint_path: Optional[str] = checkpoint_path
+        self.checkpoint_interval: int = checkpoint_interval
+        self._pages_since_checkpoint: int = 0
+
+        # pages downloaded ahead are queued as (data, next cursor, previous cursor) so the cursors above always
+        # describe the last page that was returned, not the last page that was downloaded
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._prefetch_queue: Optional[asyncio.Queue] = None
+        self._prefetch_slots: Optional[asyncio.Semaphore] = None
+
+    def _get_page_size(self, items_fetched: int) -> int:
+        if self.page_size is not None:
+            return self.page_size
+
+        max_page_size = self._max_page_sizes.get(_get_endpoint_key(self.url), _page_sizes[-1])
+        page_sizes = [page_size for page_size in _page_sizes if page_size <= max_page_size] or [_page_sizes[0]]
+        if self._pass_max_items is not None:
+            remaining = self._pass_max_items - items_fetched
+            for page_size in page_sizes:
+                if page_size >= remaining:
+                    return page_size
+        return page_sizes[-1]
+
+    async def _get_page(self, cursor: str, items_fetched: int) -> Tuple[list, Optional[str], Optional[str]]:
+        endpoint_key = _get_endpoint_key(self.url)
+        page_size = self._get_page_size(items_fetched)
+        rejected = False
+        while True:
+            try:
+                page_response = await self._client.requests.get(
+                    url=self.url,
+                    params={
+                        "cursor": cursor,
+                        "limit": page_size,
+                        "sortOrder": self.sort_order.value,
+                        **self.extra_parameters
+                    }
+                )
+                break
+            except BadRequest as exception:
+                # when the size was picked automatically and the endpoint rejected it, try the next smaller one
+                smaller_page_sizes = [smaller for smaller in _page_sizes if smaller < page_size]
+                if (
+                        self.page_size is not None
+                        or not smaller_page_sizes
+                        or not _is_limit_error(exception)
+                        or page_size <= self._working_page_sizes.get(endpoint_key, 0)
+                ):
+                    raise
+                page_size = smaller_page_sizes[-1]
+                rejected = True
+
+        if rejected:
+            self._max_page_sizes[endpoint_key] = page_size
+        if self.page_size is None and page_size > self._working_page_sizes.get(endpoint_key, 0):
+            self._working_page_sizes[endpoint_key] = page_size
+
+        page_data = page_response.json()
+
+        data = self._handle_page(page_data["data"])
+
+        return data, page_data["nextPageCursor"], page_data["previousPageCursor"]
+
+    async def _prefetch_pages(self, cursor: str, queue: asyncio.Queue, slots: asyncio.Semaphore):
+        items_fetched = self._pass_items
+        try:
+            while True:
+                await slots.acquire()
+                page = await self._get_page(cursor, items_fetched)
+                items_fetched += len(page[0])
+                queue.put_nowait(page)
+                cursor = page[1]
+                if not cursor or (self._pass_max_items is not None and items_fetched >= self._pass_max_items):
+                    return
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            queue.put_nowait(exception)
+
+    async def _next_prefetched(self) -> Tuple[list, Optional[str], Optional[str]]:
+        if self._prefetch_task is not None and self._prefetch_task.done() and self._prefetch_queue.empty():
+            # the producer stopped once it had fetched max_items, but more pages are wanted after all
+            await self.aclose()
+
+        if self._prefetch_task is None:
+            self._prefetch_queue = asyncio.Queue()
+            self._prefetch_slots = asyncio.Semaphore(self.prefetch)
+            self._prefetch_task = asyncio.ensure_future(
+                self._prefetch_pages(self.next_cursor, self._prefetch_queue, self._prefetch_slots)
+            )
+
+        page: Union[Tuple[list, Optional[str], Optional[str]], Exception] = await self._prefetch_queue.get()
+        self._prefetch_slots.release()
+        if isinstance(page, Exception):
+            # the producer has stopped, the next call starts a new one from the last page that was returned
+            await self.aclose()
+            raise page
+        return page
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns the iterator's position as a JSON-serializable dictionary.
+        The handler isn't part of the state and has to be passed to from_state again.
+
+        Returns:
+            A dictionary with the URL, parameters, cursors and amount of items yielded.
+        """
+        return {
+            "url": self.url,
+            "sort_order": self.sort_order.value,
+            "page_size": self.page_size,
+            "extra_parameters": self.extra_parameters,
+            "next_cursor": self.next_cursor,
+            "previous_cursor": self.previous_cursor,
+            "next_started": self.next_started,
+            "items_yielded": self.items_yielded
+        }
+
+    def load_state(self, state: Dict[str, Any]):
+        """
+        Moves the iterator to a position returned by get_state. Pages that were downloaded ahead are discarded.
+
+        Arguments:
+            state: The state.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+            self._prefetch_queue = None
+            self._prefetch_slots = None
+
+        self.url = state["url"]
+        self.sort_order = SortOrder(state["sort_order"])
+        self.page_size = state["page_size"]
+        self.extra_parameters = state["extra_parameters"]
+        self.next_cursor = state["next_cursor"]
+        self.previous_cursor = state["previous_cursor"]
+        self.next_started = state["next_started"]
+        self.items_yielded = state["items_yielded"]
+
+    @classmethod
+    def from_state(
+            cls,
+            client: Client,
+            state: Union[Dict[str, Any], str],
+            handler: Optional[Callable] = None,
+            handler_kwargs: Optional[dict] = None,
+            **kwargs
+    ) -> PageIterator:
+        """
+        Creates an iterator that continues from a saved position.
+
+        Arguments:
+            client: The Client.
+            state: A state returned by get_state, or the path of a checkpoint file.
+            handler: A callable object to use to convert raw endpoint data to parsed objects.
+            handler_kwargs: Extra keyword arguments to pass to the handler.
+            **kwargs: Other arguments to pass to the iterator, like max_items or checkpoint_path.
+
+        Returns:
+            A PageIterator.
+        """
+        if isinstance(state, str):
+            with open(state, "r", encoding="utf-8") as file:
+                state = json.load(file)
+
+        iterator = cls(
+            client=client,
+            url=state["url"],
+            handler=handler,
+            handler_kwargs=handler_kwargs,
+            **kwargs
+        )
+        iterator.load_state(state)
+        return iterator
+
+    def save_state(self, path: str):
+        """
+        Saves the iterator's state to a JSON file. The file is replaced atomically, so it is never left half-written.
+
+        Arguments:
+            path: The path of the file.
+        """
+        self._write_state(path, self.get_state())
+
+    @staticmethod
+    def _write_state(path: str, state: Dict[str, Any]):
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+
+    async def _checkpoint(self, force: bool = False):
+        if self.checkpoint_path is None:
+            return
+        if force or self._pages_since_checkpoint >= self.checkpoint_interval:
+            self._pages_since_checkpoint = 0
+            # the state is taken now, but written in a thread so the event loop isn't blocked by the disk
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write_state, self.checkpoint_path, self.get_state()
+            )
+
     async def next(self):
         """
         Advances the iterator to the next page.
         """
+        # the caller is done with every page returned so far, so this position is safe to resume from
+        await self._checkpoint()
+
         if self.next_started and not self.next_cursor:
             """
             If we just started and there is no cursor, this is the last page, because we can go back but not forward.
             We should raise an exception here.
             """
+            await self._checkpoint(force=True)
             raise NoMoreItems("No more items.")
 
         if not self.next_started:
             self.next_started = True
 
-        page_response = await self._client.requests.get(
-            url=self.url,
-            params={
-                "cursor": self.next_cursor,
-                "limit": self.page_size,
-                "sortOrder": self.sort_order.value,
-                **self.extra_parameters
-            }
-        )
-        page_data = page_response.json()
+        if self.prefetch > 0:
+            data, next_cursor, previous_cursor = await self._next_prefetched()
+        else:
+            data, next_cursor, previous_cursor = await self._get_page(self.next_cursor, self._pass_items)
 
         # fill in cursors
-        self.next_cursor = page_data["nextPageCursor"]
-        self.previous_cursor = page_data["previousPageCursor"]
-
-        data = page_data["data"]
-
-        if self.handler:
-            data = [
-                self.handler(
-                    client=self._client,
-                    data=item_data,
-                    **self.handler_kwargs
-                ) for item_data in data
-            ]
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+        self.items_yielded += len(data)
+        self._pass_items += len(data)
+        self._pages_since_checkpoint += 1
+
+        if not self.next_cursor:
+            await self.aclose()
+
+        return data
+
+    async def prev(self):
+        """
+        Moves the iterator back to the page before the last page it returned and returns that page's data.
+        Calling next() afterwards returns the page that came after it again.
+        """
+        if not self.previous_cursor:
+            raise NoMoreItems("No more items.")
+
+        # pages downloaded ahead no longer come next
+        await self.aclose()
+
+        data, next_cursor, previous_cursor = await self._get_page(self.previous_cursor, 0)
+
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
 
         return data
 
+    async def tail(
+            self,
+            stop_cursor: Optional[str] = None,
+            stop_id: Any = None,
+            id_field: str = "id"
+    ) -> AsyncIterator:
+        """
+        Walks the endpoint from its newest item towards older ones, stopping at a known position. This is useful to
+        only get the items that were added since the last time, like new wall posts or join requests.
+        The iterator's sort order is set to descending and it starts over from the first page.
+
+        Arguments:
+            stop_cursor: A cursor to stop at. The page at this cursor isn't requested.
+            stop_id: An item ID to stop at. The item with this ID and everything older than it isn't returned.
+            id_field: The attribute, or dictionary key in raw mode, holding each item's ID.
+
+        Returns:
+            An async iterator of items, newest first.
+        """
+        await self.aclose()
+        self.sort_order = SortOrder.Descending
+        self.next_cursor = ""
+        self.previous_cursor = ""
+        self.next_started = False
+        self._start_pass(self.max_items)
+
+        count = 0
+        try:
+            while self.max_items is None or count < self.max_items:
+                if stop_cursor is not None and self.next_started and self.next_cursor == stop_cursor:
+                    return
+                try:
+                    page = await self.next()
+                except NoMoreItems:
+                    return
+
+                for item in page:
+                    if stop_id is not None:
+                        if isinstance(item, dict):
+                            item_id = item.get(id_field)
+                        else:
+                            item_id = getattr(item, id_field, item)
+                        if item_id == stop_id:
+                            return
+                    if self.max_items is not None and count >= self.max_items:
+                        return
+                    count += 1
+                    yield item
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        """
+        Stops downloading pages ahead and discards the pages that were downloaded but not returned yet.
+        The iterator can still be used afterwards, it continues after the last page it returned.
+        """
+        task, self._prefetch_task = self._prefetch_task, None
+        self._prefetch_queue = None
+        self._prefetch_slots = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
 
 class PageNumberIterator(RobloxIterator):
     """
     Represents an iterator that is advanced with page numbers and sizes, like those seen on chat.roblox.com.
 
+    Because page numbers are known ahead of time, the iterator can request several pages at once. Pages are still
+    returned in order, and the iterator stops at the first empty page.
+
     Attributes:
         url: The endpoint to hit for new page data.
         page_number: The current page number.
@@ -268,6 +762,7 @@ class PageNumberIterator(RobloxIterator):
         extra_parameters: Extra parameters to pass to the endpoint.
         handler: A callable object to use to convert raw endpoint data to parsed objects.
         handler_kwargs: Extra keyword arguments to pass to the handler.
+        concurrency: How many page numbers are requested at once, starting at the current one.
     """
 
     def __init__(
@@ -277,9 +772,13 @@ class PageNumberIterator(RobloxIterator):
             page_size: int = 10,
             extra_parameters: Optional[dict] = None,
             handler: Optional[Callable] = None,
-            handler_kwargs: Optional[dict] = None
+            handler_kwargs: Optional[dict] = None,
+            concurrency: int = 1,
+            raw: bool = False,
+            fields: Optional[Sequence[str]] = None,
+            typecode: Optional[str] = None
     ):
-        super().__init__()
+        super().__init__(raw=raw, fields=fields, typecode=typecode)
 
         self._client: Client = client
 
@@ -291,35 +790,261 @@ class PageNumberIterator(RobloxIterator):
         self.handler: Callable = handler
         self.handler_kwargs: dict = handler_kwargs or {}
 
+        self.concurrency: int = concurrency
+
         self.iterator_position = 0
         self.iterator_items = []
 
-    async def next(self):
-        """
-        Advances the iterator to the next page.
-        """
+        # requests for the upcoming page numbers, and the first page number known to be empty
+        self._window: Dict[int, asyncio.Task] = {}
+        self._empty_page_number: Optional[int] = None
+
+    async def _get_page(self, page_number: int) -> list:
         page_response = await self._client.requests.get(
             url=self.url,
             params={
-                "pageNumber": self.page_number,
+                "pageNumber": page_number,
                 "pageSize": self.page_size,
                 **self.extra_parameters
             }
         )
-        data = page_response.json()
+        return page_response.json()
+
+    def _fill_window(self):
+        for page_number in range(self.page_number, self.page_number + self.concurrency):
+            if self._empty_page_number is not None and page_number > self._empty_page_number:
+                break
+            if page_number not in self._window:
+                self._window[page_number] = asyncio.ensure_future(self._get_page(page_number))
+
+    async def _next_concurrent(self) -> list:
+        self._fill_window()
+        task = self._window[self.page_number]
+        try:
+            data = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                del self._window[self.page_number]
+            raise
+        except Exception:
+            # drop the failed request so the page is requested again next time
+            del self._window[self.page_number]
+            raise
+        del self._window[self.page_number]
+
+        if len(data) == 0:
+            self._empty_page_number = self.page_number
+            await self.aclose()
+        return data
+
+    async def next(self):
+        """
+        Advances the iterator to the next page.
+        """
+        if self.concurrency > 1:
+            data = await self._next_concurrent()
+        else:
+            data = await self._get_page(self.page_number)
 
         if len(data) == 0:
             raise NoMoreItems("No more items.")
 
         self.page_number += 1
 
-        if self.handler:
-            data = [
-                self.handler(
-                    client=self._client,
-                    data=item_data,
-                    **self.handler_kwargs
-                ) for item_data in data
-            ]
+        return self._handle_page(data)
 
-        return data
+    async def aclose(self):
+        """
+        Cancels the requests for pages that were requested ahead but not returned yet.
+        """
+        tasks = list(self._window.values())
+        self._window.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+# marks the end of the crawl in the crawler's queues
+_crawl_done = object()
+
+
+class IteratorCrawler:
+    """
+    Drives many iterators at once and merges their pages into a single stream tagged with the source each page came
+    from, like crawling the members of hundreds of groups.
+
+    Iterators take turns: each one has at most one page request in flight, and once its page comes back it goes to
+    the back of the line, so no iterator is starved by another. Iterators are advanced with next(), so each one's
+    max_items is respected.
+
+    Attributes:
+        iterators: A dictionary mapping each source to its iterator.
+        max_concurrency: The maximum amount of page requests in flight at once, across every iterator.
+        rate_budget: A token bucket every page request takes a token from, or None to not limit the rate.
+        return_exceptions: Whether an error from an iterator is yielded as the page of its source, ending that source,
+                           instead of being raised for the whole crawl.
+    """
+
+    def __init__(
+            self,
+            iterators: Union[Dict[Any, RobloxIterator], Iterable[RobloxIterator]],
+            max_concurrency: int = 10,
+            rate: Optional[float] = None,
+            burst: Optional[float] = None,
+            buffer_size: Optional[int] = None,
+            return_exceptions: bool = False
+    ):
+        """
+        Arguments:
+            iterators: A dictionary mapping sources, like group IDs, to their iterators. If a list of iterators is
+                       passed, each iterator is its own source.
+            max_concurrency: The maximum amount of page requests in flight at once, across every iterator.
+            rate: The maximum amount of page requests per second, across every iterator. None means no limit.
+            burst: The maximum amount of page requests sent in a burst when rate is set. Defaults to one second's worth.
+            buffer_size: How many pages can wait for the consumer before the crawl pauses. Defaults to twice
+                         max_concurrency.
+            return_exceptions: Whether an error from an iterator is yielded as the page of its source, ending that
+                               source, instead of being raised for the whole crawl.
+        """
+        if not isinstance(iterators, dict):
+            iterators = {iterator: iterator for iterator in iterators}
+
+        self.iterators: Dict[Any, RobloxIterator] = iterators
+        self.max_concurrency: int = max_concurrency
+        self.rate_budget: Optional[TokenBucket] = TokenBucket(rate=rate, capacity=burst) if rate else None
+        self.return_exceptions: bool = return_exceptions
+
+        self._buffer_size: int = buffer_size or max_concurrency * 2
+        self._workers: List[asyncio.Task] = []
+        self._output: Optional[asyncio.Queue] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._remaining: int = 0
+        self._item_counts: Dict[Any, int] = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} iterators={len(self.iterators)} max_concurrency={self.max_concurrency}>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def __aiter__(self) -> AsyncIterator[Tuple[Any, Any]]:
+        return self.items()
+
+    def _start(self):
+        self._output = asyncio.Queue(maxsize=self._buffer_size)
+        self._ready = asyncio.Queue()
+        self._remaining = len(self.iterators)
+        self._item_counts = {}
+        for source in self.iterators:
+            self._ready.put_nowait(source)
+        self._workers = [
+            asyncio.ensure_future(self._work())
+            for _ in range(min(self.max_concurrency, len(self.iterators)))
+        ]
+        if not self.iterators:
+            self._output.put_nowait(_crawl_done)
+
+    async def _finish_source(self):
+        self._remaining -= 1
+        if self._remaining == 0:
+            for _ in self._workers:
+                self._ready.put_nowait(_crawl_done)
+            # the output queue is bounded and may be full, so wait for the consumer to make room
+            await self._output.put(_crawl_done)
+
+    async def _work(self):
+        while True:
+            source = await self._ready.get()
+            if source is _crawl_done:
+                return
+            iterator = self.iterators[source]
+
+            if self.rate_budget is not None:
+                await self.rate_budget.acquire()
+
+            try:
+                page = await iterator.next()
+            except NoMoreItems:
+                await self._finish_source()
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                await self._output.put((source, exception))
+                await self._finish_source()
+                continue
+
+            finished = False
+            if iterator.max_items is not None:
+                count = self._item_counts.get(source, 0)
+                page = page[:iterator.max_items - count]
+                self._item_counts[source] = count + len(page)
+                finished = self._item_counts[source] >= iterator.max_items
+
+            await self._output.put((source, page))
+            if finished:
+                await iterator.aclose()
+                await self._finish_source()
+            else:
+                self._ready.put_nowait(source)
+
+    async def pages(self) -> AsyncIterator[Tuple[Any, list]]:
+        """
+        Crawls every iterator and yields each page as it arrives.
+
+        Returns:
+            An async iterator of (source, page) tuples.
+        """
+        self._start()
+        try:
+            while True:
+                result = await self._output.get()
+                if result is _crawl_done:
+                    return
+                source, page = result
+                if isinstance(page, Exception) and not self.return_exceptions:
+                    raise page
+                yield source, page
+        finally:
+            await self.aclose()
+
+    async def items(self) -> AsyncIterator[Tuple[Any, Any]]:
+        """
+        Crawls every iterator and yields each item as its page arrives.
+
+        Returns:
+            An async iterator of (source, item) tuples. If return_exceptions is enabled, a failed source yields
+            (source, exception).
+        """
+        pages = self.pages()
+        try:
+            async for source, page in pages:
+                if isinstance(page, Exception):
+                    yield source, page
+                    continue
+                for item in page:
+                    yield source, item
+        finally:
+            await pages.aclose()
+
+    async def aclose(self):
+        """
+        Stops the crawl and cancels page requests that are in flight.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        for iterator in self.iterators.values():
+            await iterator.aclose()
@@ -0,0 +1,286 @@
+"""
+
+This module contains the rate limiter used by ro.py to keep requests under Roblox's rate limits.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from httpx import URL, Response
+
+
+def get_subdomain(url: Union[str, URL]) -> str:
+    """
+    Returns the subdomain name of a URL, like "users" for https://users.roblox.com/v1/users/1.
+
+    Arguments:
+        url: The URL.
+    """
+    host = URL(url).host
+    return host.split(".", 1)[0] if host.count(".") >= 2 else host
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses the value of a Retry-After header into a delay in seconds.
+
+    Arguments:
+        value: The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        The delay in seconds, or None if the value could not be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _parse_first_number(value: Optional[str]) -> Optional[float]:
+    """
+    Parses the first number in a header like "60, 60;w=60".
+    """
+    if not value:
+        return None
+    try:
+        return float(value.split(",", 1)[0].split(";", 1)[0].strip())
+    except ValueError:
+        return None
+
+
+def _parse_window(value: Optional[str]) -> Optional[float]:
+    """
+    Parses the window from a header like "60, 60;w=60".
+    """
+    if not value:
+        return None
+    for policy in value.split(","):
+        for parameter in policy.split(";")[1:]:
+            name, _, window = parameter.strip().partition("=")
+            if name == "w":
+                try:
+                    return float(window)
+                except ValueError:
+                    return None
+    return None
+
+
+class TokenBucket:
+    """
+    A token bucket that refills at a (possibly changing) rate.
+
+    Attributes:
+        rate: The amount of tokens added to the bucket per second.
+        max_rate: The highest rate this bucket will adapt up to.
+        min_rate: The lowest rate this bucket will adapt down to.
+        capacity: The maximum amount of tokens the bucket can hold, which is the largest allowed burst.
+        tokens: The amount of tokens currently in the bucket. This is negative when requests are queued.
+        blocked_until: A time.monotonic() timestamp before which no tokens are handed out.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            capacity: Optional[float] = None,
+            min_rate: Optional[float] = None
+    ):
+        """
+        Arguments:
+            rate: The amount of tokens added to the bucket per second.
+            capacity: The maximum amount of tokens the bucket can hold. Defaults to one second's worth of tokens.
+            min_rate: The lowest rate this bucket will adapt down to. Defaults to a tenth of the rate.
+        """
+        self.rate: float = rate
+        self.max_rate: float = rate
+        self.min_rate: float = min_rate if min_rate is not None else rate / 10
+        self.capacity: float = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens: float = self.capacity
+        self.blocked_until: float = 0.0
+        self._updated: float = time.monotonic()
+        self._block_generation: int = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} rate={self.rate} capacity={self.capacity}>"
+
+    def _refill(self, now: float):
+        # while blocked, _updated is the end of the block and no tokens are added until then
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token out of the bucket.
+
+        Returns:
+            How long, in seconds, the caller must wait before the token can be used.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        delay = self._updated - now
+        if self.tokens < 0:
+            delay += -self.tokens / self.rate
+        return max(delay, self.blocked_until - now, 0.0)
+
+    async def acquire(self):
+        """
+        Waits until a token is available and takes it.
+        """
+        while True:
+            generation = self._block_generation
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # if the bucket was blocked while we were waiting, our slot is no longer valid and we queue up again
+            if self._block_generation == generation:
+                return
+
+    def block(self, delay: float):
+        """
+        Stops handing out tokens for the passed amount of seconds.
+
+        Arguments:
+            delay: The delay in seconds.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        # a single token is available when the block ends, and requests queued during the block are spaced out at
+        # the bucket's rate from then on instead of all being released at once
+        # the debt of requests that are already waiting is dropped, they take a new token once they wake up
+        self.tokens = min(max(self.tokens, 0.0), 1.0)
+        self.blocked_until = max(self.blocked_until, now + delay)
+        self._updated = max(self._updated, self.blocked_until)
+        self._block_generation += 1
+
+
+class RateLimiter:
+    """
+    An adaptive, per-subdomain token-bucket rate limiter.
+    Each subdomain (users, groups, thumbnails...) gets its own bucket. When Roblox responds with a 429, the bucket's rate
+    is decreased and the bucket stops handing out tokens until the time given in the Retry-After or x-ratelimit-reset
+    headers has passed. Successful responses slowly raise the rate back up to its configured ceiling.
+
+    Attributes:
+        default_rate: The rate, in requests per second, used for subdomains without an entry in rates.
+        rates: A dictionary mapping subdomain names to rates in requests per second. A rate of None disables limiting.
+        burst: The bucket capacity. Defaults to one second's worth of requests.
+        adaptive: Whether to adapt the rate from responses.
+        decrease_factor: The factor the rate is multiplied by after a 429 response.
+        increase_step: The amount the rate is increased by after each successful response.
+        default_backoff: How long to stop sending requests after a 429 response without any rate limit headers.
+    """
+
+    def __init__(
+            self,
+            default_rate: Optional[float] = 10.0,
+            rates: Optional[Dict[str, Optional[float]]] = None,
+            burst: Optional[float] = None,
+            adaptive: bool = True,
+            decrease_factor: float = 0.5,
+            increase_step: float = 0.1,
+            default_backoff: float = 1.0
+    ):
+        """
+        Arguments:
+            default_rate: The rate, in requests per second, used for subdomains without an entry in rates.
+            rates: A dictionary mapping subdomain names to rates in requests per second.
+            burst: The bucket capacity. Defaults to one second's worth of requests.
+            adaptive: Whether to adapt the rate from responses.
+            decrease_factor: The factor the rate is multiplied by after a 429 response.
+            increase_step: The amount the rate is increased by after each successful response.
+            default_backoff: How long to stop sending requests after a 429 response without any rate limit headers.
+        """
+        self.default_rate: Optional[float] = default_rate
+        self.rates: Dict[str, Optional[float]] = rates or {}
+        self.burst: Optional[float] = burst
+        self.adaptive: bool = adaptive
+        self.decrease_factor: float = decrease_factor
+        self.increase_step: float = increase_step
+        self.default_backoff: float = default_backoff
+
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} default_rate={self.default_rate}>"
+
+    def get_bucket(self, subdomain: str) -> Optional[TokenBucket]:
+        """
+        Returns the bucket for a subdomain, creating it if it doesn't exist yet.
+
+        Arguments:
+            subdomain: The subdomain name.
+
+        Returns:
+            The subdomain's TokenBucket, or None if the subdomain is not rate limited.
+        """
+        try:
+            return self._buckets[subdomain]
+        except KeyError:
+            rate = self.rates.get(subdomain, self.default_rate)
+            bucket = TokenBucket(rate=rate, capacity=self.burst) if rate else None
+            self._buckets[subdomain] = bucket
+            return bucket
+
+    async def acquire(self, url: Union[str, URL]):
+        """
+        Waits until a request can be sent to the passed URL.
+
+        Arguments:
+            url: The URL the request will be sent to.
+        """
+        bucket = self.get_bucket(get_subdomain(url))
+        if bucket:
+            await bucket.acquire()
+
+    def update(self, url: Union[str, URL], response: Response):
+        """
+        Adapts the rate of the URL's subdomain based on a response.
+
+        Arguments:
+            url: The URL the request was sent to.
+            response: The response.
+        """
+        subdomain = get_subdomain(url)
+        bucket = self.get_bucket(subdomain)
+        if not bucket:
+            return
+
+        headers = response.headers
+        limit = _parse_first_number(headers.get("x-ratelimit-limit"))
+        window = _parse_window(headers.get("x-ratelimit-limit"))
+        remaining = _parse_first_number(headers.get("x-ratelimit-remaining"))
+        reset = _parse_first_number(headers.get("x-ratelimit-reset"))
+
+        if self.adaptive and limit and window:
+            # never go above what the server says we are allowed to send
+            ceiling = limit / window
+            bucket.max_rate = min(self.rates.get(subdomain, self.default_rate), ceiling)
+            bucket.rate = min(bucket.rate, bucket.max_rate)
+
+        if response.status_code == 429:
+            delay = parse_retry_after(headers.get("Retry-After"))
+            if delay is None:
+                delay = reset if reset is not None else self.default_backoff
+            bucket.block(delay)
+            if self.adaptive:
+                bucket.rate = max(bucket.min_rate, bucket.rate * self.decrease_factor)
+        elif remaining is not None and remaining <= 0 and reset:
+            bucket.block(reset)
+        elif self.adaptive and not response.is_error:
+            bucket.rate = min(bucket.max_rate, bucket.rate + self.increase_step)
@@ -7,12 +7,17 @@ This module contains classes used internally by ro.py for sending requests to Ro
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import time
 from json import JSONDecodeError
-from typing import Dict
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, Union
 
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Limits, Response, Timeout, TransportError, URL
 
+from .cache import ResponseCache
 from .exceptions import get_exception_from_status_code
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
 
 _xcsrf_allowed_methods: Dict[str, bool] = {
     "post": True,
@@ -21,18 +26,73 @@ _xcsrf_allowed_methods: Dict[str, bool] = {
     "delete": True
 }
 
+default_timeout: Timeout = Timeout(30.0, connect=10.0, pool=60.0)
+
+_request_key_arguments = {"url", "params", "headers"}
+
+
+def _get_request_key(method: str, *args, **kwargs) -> Optional[Tuple]:
+    """
+    Returns a hashable key identifying a request by its method, URL, parameters and headers, or None if the request has
+    other arguments (like a body) and can't be identified by those alone.
+    """
+    if len(args) > 1 or not _request_key_arguments.issuperset(kwargs):
+        return None
+    url = kwargs["url"] if "url" in kwargs else args[0]
+    headers = kwargs.get("headers")
+    return (
+        method.upper(),
+        str(URL(url, params=kwargs.get("params"))),
+        tuple(sorted((name.lower(), value) for name, value in headers.items())) if headers else ()
+    )
+
 
 class CleanAsyncClient(AsyncClient):
     """
     This is a clean-on-delete version of httpx.AsyncClient.
+    The defaults are tuned for many concurrent requests against a small set of Roblox hosts: a large connection pool,
+    long-lived keep-alive connections so TLS handshakes are reused, and a generous pool timeout so queued coroutines
+    wait for a free connection instead of failing.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(
+            self,
+            max_connections: Optional[int] = 256,
+            max_keepalive_connections: Optional[int] = 64,
+            keepalive_expiry: Optional[float] = 30.0,
+            timeout: Union[Timeout, float, None] = None,
+            http2: bool = False,
+            **kwargs
+    ):
+        """
+        Arguments:
+            max_connections: The maximum amount of open connections. None means no limit.
+            max_keepalive_connections: The maximum amount of idle connections kept open for reuse. None means no limit.
+            keepalive_expiry: How long, in seconds, an idle connection is kept open.
+            timeout: A httpx.Timeout with per-phase (connect, read, write, pool) timeouts, or a number of seconds used
+                     for all of them. Defaults to default_timeout.
+            http2: Whether to use HTTP/2, which multiplexes concurrent requests over a single connection per host.
+                   This requires the h2 package, which can be installed with `pip install roblox[http2]`.
+            **kwargs: Extra keyword arguments passed to httpx.AsyncClient.
+        """
+        super().__init__(
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=default_timeout if timeout is None else timeout,
+            http2=http2,
+            **kwargs
+        )
 
     def __del__(self):
+        # This is only a fallback for sessions that were never closed - Client.aclose() or "async with Client()"
+        # should be used to close the session deterministically.
+        if self.is_closed:
+            return
         try:
-            asyncio.get_event_loop().create_task(self.aclose())
+            asyncio.get_running_loop().create_task(self.aclose())
         except RuntimeError:
             pass
 
@@ -44,17 +104,30 @@ class Requests:
     Attributes:
         session: Base session object to use when sending requests.
         xcsrf_token_name: The header that will contain the Cross-Site Request Forgery token.
+        xcsrf_token_url: The endpoint used by refresh_xcsrf_token to fetch a new token.
+        rate_limiter: The rate limiter used to pace requests, or None if requests are not rate limited.
+        retry_policy: The policy used to retry failed requests, or None if failed requests are not retried.
+        coalesce_requests: Whether concurrent identical GET requests share a single in-flight request.
+        cache: The cache GET responses are stored in, or None if responses are not cached.
     """
 
     def __init__(
             self,
             session: CleanAsyncClient = None,
-            xcsrf_token_name: str = "X-CSRF-Token"
+            xcsrf_token_name: str = "X-CSRF-Token",
+            rate_limiter: Optional[RateLimiter] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            coalesce_requests: bool = False,
+            cache: Optional[ResponseCache] = None
     ):
         """
         Arguments:
             session: A custom session object to use for sending requests, compatible with httpx.AsyncClient.
             xcsrf_token_name: The header to place X-CSRF-Token data into.
+            rate_limiter: A rate limiter used to pace requests to each subdomain.
+            retry_policy: A policy used to retry failed requests.
+            coalesce_requests: Whether concurrent identical GET requests share a single in-flight request.
+            cache: A cache to store GET responses in.
         """
         self.session: CleanAsyncClient
 
@@ -64,10 +137,176 @@ class Requests:
             self.session = session
 
         self.xcsrf_token_name: str = xcsrf_token_name
+        self.xcsrf_token_url: str = "https://auth.roblox.com/v2/logout"
+        self._xcsrf_acquisition: Optional[asyncio.Future] = None
+        # whether a response has shown that the current token, or the lack of one, is accepted
+        self._xcsrf_verified: bool = False
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.retry_policy: Optional[RetryPolicy] = retry_policy
+        self.coalesce_requests: bool = coalesce_requests
+        self.cache: Optional[ResponseCache] = cache
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
 
         self.session.headers["User-Agent"] = "Roblox/WinInet"
         self.session.headers["Referer"] = "www.roblox.com"
 
+    async def __aenter__(self) -> Requests:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        """
+        Whether the session has been closed.
+        """
+        return self.session.is_closed
+
+    async def aclose(self):
+        """
+        Closes the session and all of its pooled connections. Calling this more than once does nothing.
+        """
+        if not self.session.is_closed:
+            await self.session.aclose()
+
+    async def warm_up(self, urls: List[str], connections: int = 1):
+        """
+        Opens pooled connections to the passed URLs ahead of time, so the first real requests don't pay for the TCP and
+        TLS handshakes. The responses are discarded.
+
+        Arguments:
+            urls: The URLs to connect to.
+            connections: How many connections to open to each URL.
+        """
+        await asyncio.gather(*[
+            self.request("HEAD", url, skip_roblox=True)
+            for url in urls
+            for _ in range(connections)
+        ])
+
+    async def _send(self, method: str, *args, **kwargs) -> Response:
+        """
+        Sends a request through the session, waiting for the rate limiter first if there is one.
+        """
+        if not self.rate_limiter:
+            return await self.session.request(method, *args, **kwargs)
+
+        url = kwargs["url"] if "url" in kwargs else args[0]
+        await self.rate_limiter.acquire(url)
+        response = await self.session.request(method, *args, **kwargs)
+        self.rate_limiter.update(url, response)
+        return response
+
+    async def _request_and_cache(
+            self,
+            key: Tuple,
+            conditional_headers: Dict[str, str],
+            method: str,
+            *args,
+            **kwargs
+    ) -> Response:
+        """
+        Sends a GET request and stores its response in the cache, if there is one.
+        The conditional headers are used to revalidate a stale cached response. If it is still valid, Roblox answers with
+        304 Not Modified and the cached response is returned instead. If the cached response is gone by then, the
+        request is sent again without the conditional headers so the caller never receives an empty 304.
+        """
+        request_kwargs = kwargs
+        if conditional_headers:
+            request_kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), **conditional_headers}}
+        response = await self._request(method, *args, handle_xcsrf_token=False, skip_roblox=False, **request_kwargs)
+        if not self.cache:
+            return response
+
+        stored_response = await self.cache.store(key, response)
+        if stored_response is None:
+            response = await self._request(method, *args, handle_xcsrf_token=False, skip_roblox=False, **kwargs)
+            stored_response = await self.cache.store(key, response)
+        return stored_response or response
+
+    async def _coalesce(self, key: Tuple, coroutine: Coroutine[Any, Any, Response]) -> Response:
+        """
+        Awaits the request with the passed key if one is already in flight, otherwise sends it.
+        Every caller receives the same response (or exception).
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine)
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            coroutine.close()
+        # One caller being cancelled must not cancel the request for everyone else.
+        return await asyncio.shield(task)
+
+    def _get_identity(self) -> str:
+        """
+        Returns a hash identifying the account the session is authenticated as, or an empty string if it isn't.
+        The token itself is never put in cache keys, as they can end up on disk.
+        The cookie jar is read directly because cookies.get raises CookieConflict when the session holds more than one
+        .ROBLOSECURITY cookie (for example for different domains), in which case all of them are hashed together.
+        """
+        tokens = sorted(
+            (cookie.domain, cookie.path, cookie.value)
+            for cookie in self.session.cookies.jar
+            if cookie.name == ".ROBLOSECURITY" and cookie.value
+        )
+        if not tokens:
+            return ""
+        return hashlib.sha256(repr(tokens).encode("utf-8")).hexdigest()
+
+    async def _wait_for_xcsrf_token(self) -> Optional[asyncio.Future]:
+        """
+        Waits for any X-CSRF-Token acquisition in progress to finish.
+        If no response has confirmed the current token yet - because there is none, it may be stale or it was just
+        replaced - the caller becomes the one checking it and gets back a future that it must pass to
+        _finish_xcsrf_acquisition once its request is done. Every other caller waits for that future, so a stale token
+        costs a single 403 instead of one per request.
+        """
+        while self._xcsrf_acquisition is not None:
+            await asyncio.shield(self._xcsrf_acquisition)
+
+        if self._xcsrf_verified:
+            return None
+
+        self._xcsrf_acquisition = asyncio.get_running_loop().create_future()
+        return self._xcsrf_acquisition
+
+    def _finish_xcsrf_acquisition(self, acquisition: asyncio.Future):
+        if self._xcsrf_acquisition is acquisition:
+            self._xcsrf_acquisition = None
+        acquisition.set_result(None)
+
+    async def refresh_xcsrf_token(self) -> Optional[str]:
+        """
+        Fetches a new X-CSRF-Token and stores it on the session. Call this before a burst of POST/PATCH/DELETE requests
+        so that none of them has to fail with a 403 first.
+        Concurrent calls are coalesced into a single request, and requests that need a token wait for it.
+
+        Returns:
+            The new token, or None if Roblox did not return one.
+        """
+        if self._xcsrf_acquisition is not None:
+            await asyncio.shield(self._xcsrf_acquisition)
+            return self.session.headers.get(self.xcsrf_token_name)
+
+        acquisition = self._xcsrf_acquisition = asyncio.get_running_loop().create_future()
+        try:
+            # An empty token is never valid, so the endpoint rejects the request and hands us a fresh token.
+            response = await self._send(
+                "POST",
+                url=self.xcsrf_token_url,
+                headers={self.xcsrf_token_name: ""}
+            )
+            token = response.headers.get(self.xcsrf_token_name)
+            if token:
+                self.session.headers[self.xcsrf_token_name] = token
+                self._xcsrf_verified = True
+            return token
+        finally:
+            self._finish_xcsrf_acquisition(acquisition)
+
     async def request(self, method: str, *args, **kwargs) -> Response:
         """
         Arguments:
@@ -80,23 +319,78 @@ class Requests:
         handle_xcsrf_token = kwargs.pop("handle_xcsrf_token", True)
         skip_roblox = kwargs.pop("skip_roblox", False)
 
-        response = await self.session.request(method, *args, **kwargs)
-
-        if skip_roblox:
-            return response
-
-        method = method.lower()
-
-        if handle_xcsrf_token and self.xcsrf_token_name in response.headers and _xcsrf_allowed_methods.get(method):
-            self.session.headers[self.xcsrf_token_name] = response.headers[self.xcsrf_token_name]
-            if response.status_code == 403:  # Request failed, send it again
-                response = await self.session.request(method, *args, **kwargs)
+        if (self.cache or self.coalesce_requests) and method.upper() == "GET" and not skip_roblox:
+            key = _get_request_key(method, *args, **kwargs)
+            if key is not None:
+                # responses can depend on who is logged in, so they are never shared between accounts
+                key += (self._get_identity(),)
+                conditional_headers = {}
+                if self.cache:
+                    response, conditional_headers = await self.cache.lookup(key)
+                    if response is not None:
+                        return response
+                coroutine = self._request_and_cache(key, conditional_headers, method, *args, **kwargs)
+                if self.coalesce_requests:
+                    return await self._coalesce(key, coroutine)
+                return await coroutine
+
+        if not handle_xcsrf_token or skip_roblox or not _xcsrf_allowed_methods.get(method.lower()):
+            return await self._request(method, *args, handle_xcsrf_token=False, skip_roblox=skip_roblox, **kwargs)
+
+        # Until a response confirms the token, only one request at a time goes out. The others wait for it to bring a
+        # new token back instead of all failing with a 403 and being sent twice.
+        acquisition = await self._wait_for_xcsrf_token()
+        try:
+            return await self._request(method, *args, handle_xcsrf_token=True, skip_roblox=False, **kwargs)
+        finally:
+            if acquisition:
+                self._finish_xcsrf_acquisition(acquisition)
 
-        if kwargs.get("stream"):
-            # Streamed responses should not be decoded, so we immediately return the response.
-            return response
+    async def _request(self, method: str, *args, handle_xcsrf_token: bool, skip_roblox: bool, **kwargs) -> Response:
+        """
+        Sends a request, handling X-CSRF-Tokens, retries and Roblox errors.
+        """
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            sent_token = self.session.headers.get(self.xcsrf_token_name)
+            try:
+                response = await self._send(method, *args, **kwargs)
+            except TransportError as exception:
+                delay = self.retry_policy and self.retry_policy.get_retry_delay(
+                    method=method,
+                    attempt=attempt,
+                    elapsed=time.monotonic() - started,
+                    exception=exception
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if skip_roblox:
+                return response
+
+            if handle_xcsrf_token:
+                if response.status_code == 403 and self.xcsrf_token_name in response.headers:
+                    # Request failed, send it again. If another request already replaced the token we sent, reuse
+                    # its token instead of overwriting it.
+                    if self.session.headers.get(self.xcsrf_token_name) == sent_token:
+                        self.session.headers[self.xcsrf_token_name] = response.headers[self.xcsrf_token_name]
+                        self._xcsrf_verified = False
+                    response = await self._send(method, *args, **kwargs)
+                if not (response.status_code == 403 and self.xcsrf_token_name in response.headers):
+                    self._xcsrf_verified = True
+
+            if kwargs.get("stream"):
+                # Streamed responses should not be decoded, so we immediately return the response.
+                return response
+
+            if not response.is_error:
+                return response
 
-        if response.is_error:
             # Something went wrong, parse an error
             content_type = response.headers.get("Content-Type")
             errors = None
@@ -112,9 +406,18 @@ class Requests:
                 response=response,
                 errors=errors
             )
-            raise exception
-        else:
-            return response
+
+            delay = self.retry_policy and self.retry_policy.get_retry_delay(
+                method=method,
+                attempt=attempt,
+                elapsed=time.monotonic() - started,
+                response=response,
+                errors=exception.errors
+            )
+            if delay is None:
+                raise exception
+            await asyncio.sleep(delay)
+            attempt += 1
 
     async def get(self, *args, **kwargs) -> Response:
         """
@@ -0,0 +1,165 @@
+"""
+
+This module contains the retry policy used by ro.py to decide when failed requests should be sent again.
+
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Iterable, List, Optional
+
+from httpx import ConnectError, ConnectTimeout, PoolTimeout, Response, TransportError
+
+from .exceptions import ResponseError
+from .ratelimit import parse_retry_after
+
+_unsent_exceptions = (ConnectError, ConnectTimeout, PoolTimeout)
+
+
+class RetryPolicy:
+    """
+    Decides whether, and after how long, a failed request should be retried.
+    Delays use exponential backoff with "full jitter", so clients that failed at the same time don't all retry at the
+    same time.
+
+    Requests are retried when:
+    - the response status is in retry_statuses and the method is idempotent, or
+    - the response status is 429 (the request was not processed, so any method can be retried), or
+    - Roblox marked one of the response's errors as retryable, or
+    - the connection failed before the request was sent, or
+    - any other transport error happened and the method is idempotent.
+
+    Attributes:
+        max_retries: The maximum amount of times a single request is retried.
+        backoff_base: The base delay in seconds. The delay ceiling for attempt n is backoff_base * 2 ** n.
+        backoff_max: The largest delay in seconds between two attempts.
+        total_budget: The maximum time in seconds spent on a single request, including retries. None means no limit.
+        retry_statuses: Response status codes that can be retried.
+        idempotent_methods: Methods that are safe to send more than once.
+        respect_retry_after: Whether to wait at least as long as the Retry-After header asks.
+    """
+
+    def __init__(
+            self,
+            max_retries: int = 3,
+            backoff_base: float = 0.5,
+            backoff_max: float = 30.0,
+            total_budget: Optional[float] = 60.0,
+            retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+            idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+            respect_retry_after: bool = True
+    ):
+        """
+        Arguments:
+            max_retries: The maximum amount of times a single request is retried.
+            backoff_base: The base delay in seconds.
+            backoff_max: The largest delay in seconds between two attempts.
+            total_budget: The maximum time in seconds spent on a single request, including retries.
+            retry_statuses: Response status codes that can be retried.
+            idempotent_methods: Methods that are safe to send more than once.
+            respect_retry_after: Whether to wait at least as long as the Retry-After header asks.
+        """
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.total_budget: Optional[float] = total_budget
+        self.retry_statuses: frozenset = frozenset(retry_statuses)
+        self.idempotent_methods: frozenset = frozenset(method.upper() for method in idempotent_methods)
+        self.respect_retry_after: bool = respect_retry_after
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} max_retries={self.max_retries} total_budget={self.total_budget}>"
+
+    def is_idempotent(self, method: str) -> bool:
+        """
+        Returns whether the passed method is safe to send more than once.
+
+        Arguments:
+            method: The request method.
+        """
+        return method.upper() in self.idempotent_methods
+
+    def should_retry_response(
+            self,
+            method: str,
+            response: Response,
+            errors: Optional[List[ResponseError]] = None
+    ) -> bool:
+        """
+        Returns whether a request that received an error response should be retried.
+
+        Arguments:
+            method: The request method.
+            response: The error response.
+            errors: The Roblox errors parsed from the response.
+        """
+        if errors and any(error.retryable for error in errors):
+            return True
+        if response.status_code not in self.retry_statuses:
+            return False
+        return response.status_code == 429 or self.is_idempotent(method)
+
+    def should_retry_exception(self, method: str, exception: Exception) -> bool:
+        """
+        Returns whether a request that raised a transport exception should be retried.
+
+        Arguments:
+            method: The request method.
+            exception: The exception raised while sending the request.
+        """
+        if isinstance(exception, _unsent_exceptions):
+            return True
+        return isinstance(exception, TransportError) and self.is_idempotent(method)
+
+    def get_delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """
+        Returns how long to wait before sending the next attempt.
+
+        Arguments:
+            attempt: The amount of retries already made for this request.
+            response: The error response, if there was one.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
+
+    def get_retry_delay(
+            self,
+            method: str,
+            attempt: int,
+            elapsed: float,
+            response: Optional[Response] = None,
+            errors: Optional[List[ResponseError]] = None,
+            exception: Optional[Exception] = None
+    ) -> Optional[float]:
+        """
+        Decides whether a failed request should be retried.
+
+        Arguments:
+            method: The request method.
+            attempt: The amount of retries already made for this request.
+            elapsed: How long, in seconds, has been spent on this request so far.
+            response: The error response, if there was one.
+            errors: The Roblox errors parsed from the response.
+            exception: The transport exception, if there was one.
+
+        Returns:
+            The delay to wait before retrying, or None if the request should not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if exception is not None:
+            if not self.should_retry_exception(method, exception):
+                return None
+        elif response is None or not self.should_retry_response(method, response, errors):
+            return None
+
+        delay = self.get_delay(attempt, response)
+        if self.total_budget is not None and elapsed + delay > self.total_budget:
+            return None
+        return delay
@@ -0,0 +1,253 @@
+"""
+
+This module contains sinks, which write iterator items to files as they arrive so exports use a constant amount of
+memory no matter how many items there are.
+
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from datetime import datetime
+from enum import Enum
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Union
+
+FileOrPath = Union[str, IO]
+
+
+def to_serializable(value: Any) -> Any:
+    """
+    Converts a value into plain dictionaries, lists and scalars that can be written to a file.
+    ro.py objects are converted into dictionaries of their public attributes, so the client and other private
+    attributes are left out. Enums are replaced by their values and datetimes by ISO 8601 strings.
+
+    Arguments:
+        value: The value to convert.
+
+    Returns:
+        The converted value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(key): to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_serializable(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return {
+            key: to_serializable(item)
+            for key, item in vars(value).items()
+            if not key.startswith("_")
+        }
+    return str(value)
+
+
+def flatten_record(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flattens nested dictionaries into a single dictionary with dotted keys, like {"user.id": 1}.
+    Lists are kept as JSON strings.
+
+    Arguments:
+        record: The dictionary to flatten.
+        prefix: A prefix to add to every key.
+
+    Returns:
+        The flattened dictionary.
+    """
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, prefix=f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _to_record(item: Any) -> Dict[str, Any]:
+    record = to_serializable(item)
+    if not isinstance(record, dict):
+        record = {"value": record}
+    return flatten_record(record)
+
+
+class Sink:
+    """
+    Represents a destination items are written to. Items are buffered and written in batches of batch_size.
+    Subclass this and implement _write_batch to add your own format.
+
+    Attributes:
+        batch_size: How many items are buffered before they are written.
+        items_written: How many items were written so far, including buffered items.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        """
+        Arguments:
+            batch_size: How many items are buffered before they are written.
+        """
+        self.batch_size: int = batch_size
+        self.items_written: int = 0
+        self._buffer: List[Any] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, item: Any):
+        """
+        Adds an item to the sink.
+
+        Arguments:
+            item: The item.
+        """
+        self._buffer.append(item)
+        self.items_written += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, items: Iterable[Any]):
+        """
+        Adds several items to the sink.
+
+        Arguments:
+            items: The items.
+        """
+        for item in items:
+            self.write(item)
+
+    def flush(self):
+        """
+        Writes the buffered items.
+        """
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._write_batch(batch)
+
+    def close(self):
+        """
+        Writes the buffered items and closes the sink.
+        """
+        self.flush()
+
+    def _write_batch(self, items: List[Any]):
+        raise NotImplementedError
+
+
+class _FileSink(Sink):
+    """
+    A sink that writes text to a file. Files opened by the sink are closed with it, files passed in are left open.
+    """
+
+    def __init__(self, file: FileOrPath, batch_size: int = 1000, newline: Optional[str] = None):
+        super().__init__(batch_size=batch_size)
+        if isinstance(file, str):
+            self._file: IO = open(file, "w", encoding="utf-8", newline=newline)
+            self._owns_file: bool = True
+        else:
+            self._file: IO = file
+            self._owns_file: bool = False
+
+    def flush(self):
+        super().flush()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+class NDJSONSink(_FileSink):
+    """
+    Writes each item as a line of JSON.
+    """
+
+    def __init__(self, file: FileOrPath, batch_size: int = 1000):
+        """
+        Arguments:
+            file: A path or a text file to write to.
+            batch_size: How many items are buffered before they are written.
+        """
+        super().__init__(file=file, batch_size=batch_size)
+
+    def _write_batch(self, items: List[Any]):
+        self._file.write("".join(json.dumps(to_serializable(item)) + "\n" for item in items))
+
+
+class CSVSink(_FileSink):
+    """
+    Writes each item as a row of a CSV file. Nested attributes become dotted columns, like "user.id".
+
+    Attributes:
+        fields: The columns of the file. If they weren't passed in, they are taken from the first item.
+    """
+
+    def __init__(self, file: FileOrPath, fields: Optional[Sequence[str]] = None, batch_size: int = 1000):
+        """
+        Arguments:
+            file: A path or a text file to write to. Files should be opened with newline="".
+            fields: The columns to write. Defaults to every column of the first item. Other columns are left out.
+            batch_size: How many items are buffered before they are written.
+        """
+        super().__init__(file=file, batch_size=batch_size, newline="")
+        self.fields: Optional[List[str]] = list(fields) if fields is not None else None
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write_batch(self, items: List[Any]):
+        records = [_to_record(item) for item in items]
+        if self._writer is None:
+            if self.fields is None:
+                self.fields = list(records[0])
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(records)
+
+
+class ParquetSink(Sink):
+    """
+    Writes items to a Parquet file, one row group per batch. Nested attributes become dotted columns, like "user.id".
+    This requires pyarrow, which can be installed with `pip install roblox[parquet]`.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10000):
+        """
+        Arguments:
+            path: The path of the file to write to.
+            batch_size: How many items are written in each row group.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow. Install it with `pip install roblox[parquet]`.")
+
+        super().__init__(batch_size=batch_size)
+        self.path: str = path
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self._writer = None
+
+    def _write_batch(self, items: List[Any]):
+        records = [_to_record(item) for item in items]
+        if self._writer is None:
+            table = self._pyarrow.Table.from_pylist(records)
+            self._writer = self._parquet.ParquetWriter(self.path, table.schema)
+        else:
+            table = self._pyarrow.Table.from_pylist(records, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
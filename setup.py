@@ -32,7 +32,15 @@ setup_info = {
     "install_requires": [
         "httpx>=0.21.0",
         "python-dateutil>=2.8.0"
-    ]
+    ],
+    "extras_require": {
+        "http2": [
+            "httpx[http2]>=0.21.0"
+        ],
+        "parquet": [
+            "pyarrow>=7.0.0"
+        ]
+    }
 }
 
 
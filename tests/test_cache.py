@@ -0,0 +1,89 @@
+"""
+
+Tests the response cache and its backends without making requests to Roblox.
+
+"""
+
+import asyncio
+
+import httpx
+
+from roblox.utilities.cache import ResponseCache, SQLiteCacheBackend
+from roblox.utilities.requests import Requests
+
+
+def test_sqlite_backend_evicts_least_recently_used_in_batches(tmp_path):
+    """
+    Once the table is over max_size, the least recently used entries are evicted down to 90% of max_size.
+    """
+    async def run():
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_size=10, access_batch_size=2)
+        try:
+            for index in range(10):
+                await backend.set(f"key{index}", index)
+            # reading key0 twice fills the access batch, so it is no longer the least recently used entry
+            await backend.get("key0")
+            await backend.get("key0")
+            await backend.set("key10", 10)
+
+            count = backend._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return count, await backend.get("key0"), await backend.get("key1"), await backend.get("key10")
+        finally:
+            backend.close()
+
+    assert asyncio.run(run()) == (9, 0, None, 10)
+
+
+def test_sqlite_backend_expires_entries(tmp_path):
+    async def run():
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        try:
+            await backend.set("short", 1, ttl=0.01)
+            await backend.set("long", 2, ttl=60)
+            await asyncio.sleep(0.02)
+            return await backend.get("short"), await backend.get("long")
+        finally:
+            backend.close()
+
+    assert asyncio.run(run()) == (None, 2)
+
+
+def test_identity_with_conflicting_cookies():
+    """
+    Two .ROBLOSECURITY cookies for different domains must not break cached requests.
+    """
+    requests = Requests(session=httpx.AsyncClient())
+    assert requests._get_identity() == ""
+
+    requests.session.cookies.set(".ROBLOSECURITY", "a", domain=".roblox.com")
+    single = requests._get_identity()
+    requests.session.cookies.set(".ROBLOSECURITY", "b", domain="www.roblox.com")
+    both = requests._get_identity()
+
+    assert single and both and single != both
+    assert both == requests._get_identity()
+
+
+def test_not_modified_after_eviction_is_sent_again():
+    """
+    A 304 for a response that was evicted while the request was in flight is replaced by a full response.
+    """
+    async def run():
+        cache = ResponseCache(default_ttl=0.01)
+        sent_headers = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            sent_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                await cache.backend.clear()
+                return httpx.Response(304, request=request, headers={"ETag": '"v1"'})
+            return httpx.Response(200, request=request, headers={"ETag": '"v1"'}, json={"value": 1})
+
+        requests = Requests(session=httpx.AsyncClient(transport=httpx.MockTransport(handler)), cache=cache)
+        url = "https://users.roblox.com/v1/users/1"
+        await requests.get(url)
+        await asyncio.sleep(0.02)
+        response = await requests.get(url)
+        return response.status_code, response.json(), sent_headers
+
+    assert asyncio.run(run()) == (200, {"value": 1}, [None, '"v1"', None])
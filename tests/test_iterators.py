@@ -0,0 +1,166 @@
+"""
+
+Tests iterator behaviour that doesn't depend on Roblox, using fake iterators and mocked responses.
+
+"""
+
+import asyncio
+
+import httpx
+
+from roblox import Client
+from roblox.utilities.exceptions import BadRequest, NoMoreItems
+from roblox.utilities.iterators import IteratorCrawler, PageIterator, RobloxIterator
+
+
+class FakeIterator(RobloxIterator):
+    """
+    An iterator that returns a fixed list of pages.
+    """
+
+    def __init__(self, pages: list):
+        super().__init__()
+        self._pages = list(pages)
+
+    async def next(self):
+        await asyncio.sleep(0)
+        if not self._pages:
+            raise NoMoreItems("No more items.")
+        return self._pages.pop(0)
+
+
+def test_crawler_slow_consumer_small_buffer():
+    """
+    The crawl must end even when the output buffer is full as the last source finishes.
+    """
+    async def crawl():
+        iterators = {
+            source: FakeIterator([[f"{source}-{page}"] for page in range(3)])
+            for source in ("a", "b", "c")
+        }
+        pages = []
+        async for source, page in IteratorCrawler(iterators, max_concurrency=3, buffer_size=1).pages():
+            await asyncio.sleep(0.02)
+            pages.append((source, page))
+        return pages
+
+    pages = asyncio.run(asyncio.wait_for(crawl(), timeout=5))
+    assert len(pages) == 9
+    for source in ("a", "b", "c"):
+        assert [page for page_source, page in pages if page_source == source] == [
+            [f"{source}-{page}"] for page in range(3)
+        ]
+
+
+def _get_page_client(requested_limits: list, total: int = 100) -> Client:
+    """
+    Returns a client whose cursor-based endpoints return the numbers from 0 to total, recording each requested limit.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        start = int(request.url.params.get("cursor") or 0)
+        requested_limits.append(limit)
+        end = min(start + limit, total)
+        return httpx.Response(200, request=request, json={
+            "data": list(range(start, end)),
+            "nextPageCursor": str(end) if end < total else None,
+            "previousPageCursor": str(start) if start else None
+        })
+
+    client = Client()
+    client.requests.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_page_iterator_prefetch_stops_at_max_items():
+    """
+    Looping over a prefetching iterator with max_items must end once max_items items were returned.
+    """
+    async def iterate():
+        client = _get_page_client([])
+        iterator = PageIterator(client, "https://groups.roblox.com/v1/groups/1/users", page_size=10, max_items=20,
+                                prefetch=2)
+        return [item async for item in iterator]
+
+    assert asyncio.run(asyncio.wait_for(iterate(), timeout=5)) == list(range(20))
+
+
+def test_page_iterator_sizes_pages_per_pass():
+    """
+    Automatic page sizes depend on the max_items of the current loop, not on items returned by earlier loops.
+    """
+    async def iterate():
+        requested_limits = []
+        client = _get_page_client(requested_limits)
+        iterator = PageIterator(client, "https://groups.roblox.com/v1/groups/1/users", max_items=50)
+        first = [item async for item in iterator]
+        state = iterator.get_state()
+
+        resumed = PageIterator.from_state(client, state, max_items=50)
+        second = [item async for item in resumed]
+        third = await resumed.flatten(7)
+        return first, second, third, requested_limits
+
+    first, second, third, requested_limits = asyncio.run(asyncio.wait_for(iterate(), timeout=5))
+    assert first == list(range(50))
+    assert second == list(range(50, 100))
+    assert third == []
+    assert requested_limits == [50, 50]
+
+
+def _get_rejecting_client(requested_limits: list, max_limit: int, error: dict) -> Client:
+    """
+    Returns a client whose cursor-based endpoints return a page of a single item, and respond with a 400 containing
+    error when the requested limit is over max_limit.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        requested_limits.append(limit)
+        if limit > max_limit:
+            return httpx.Response(400, request=request, json={"errors": [error]})
+        return httpx.Response(200, request=request, json={
+            "data": [0],
+            "nextPageCursor": None,
+            "previousPageCursor": None
+        })
+
+    client = Client()
+    client.requests.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_page_iterator_falls_back_on_limit_errors_only():
+    """
+    Automatic page sizes only get smaller when the endpoint rejects the limit, not on any other 400.
+    """
+    async def iterate(url: str, max_limit: int, error: dict) -> list:
+        requested_limits = []
+        client = _get_rejecting_client(requested_limits, max_limit, error)
+        try:
+            await PageIterator(client, url).flatten()
+        except BadRequest:
+            pass
+        return requested_limits
+
+    limit_error = {"code": 0, "message": "Invalid limit.", "field": "limit"}
+    group_error = {"code": 1, "message": "The group is invalid or does not exist."}
+
+    assert asyncio.run(iterate("https://groups.roblox.com/v1/groups/1/limited", 25, limit_error)) == [100, 50, 25]
+    assert asyncio.run(iterate("https://groups.roblox.com/v1/groups/1/invalid", 0, group_error)) == [100]
+
+
+def test_page_iterator_stops_probing_after_success():
+    """
+    Once a page size has worked on an endpoint, a 400 for it is raised instead of trying smaller sizes.
+    """
+    async def iterate(max_limit: int) -> list:
+        requested_limits = []
+        client = _get_rejecting_client(requested_limits, max_limit, {"code": 0, "message": "Invalid limit."})
+        try:
+            await PageIterator(client, "https://groups.roblox.com/v1/groups/1/working").flatten()
+        except BadRequest:
+            pass
+        return requested_limits
+
+    assert asyncio.run(iterate(100)) == [100]
+    assert asyncio.run(iterate(0)) == [100]
@@ -0,0 +1,74 @@
+"""
+
+Tests the presence watcher with mocked responses.
+
+"""
+
+import asyncio
+
+import httpx
+
+from roblox import Client
+from roblox.presence import PresenceType
+
+
+def _get_presence_client(responses: list) -> Client:
+    """
+    Returns a client whose presence endpoint answers with each status code or user presence type in responses in turn,
+    repeating the last one.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        if response >= 100:
+            return httpx.Response(response, request=request)
+        return httpx.Response(200, request=request, json={"userPresences": [{
+            "userPresenceType": response,
+            "lastLocation": "",
+            "placeId": None,
+            "rootPlaceId": None,
+            "gameId": None,
+            "universeId": None,
+            "userId": 1,
+            "lastOnline": "2024-01-01T00:00:00Z"
+        }]})
+
+    client = Client()
+    client.requests.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_watcher_survives_failed_polls():
+    """
+    Errors from the presence endpoint are retried later instead of ending the iteration.
+    """
+    async def watch():
+        client = _get_presence_client([0, 503, 429, 1])
+        watcher = client.presence.watch([1], active_interval=0.01, offline_interval=0.05)
+        async for change in watcher:
+            watcher.stop()
+            return change.previous_presence_type, change.presence.user_presence_type
+
+    assert asyncio.run(asyncio.wait_for(watch(), timeout=5)) == (PresenceType.offline, PresenceType.online)
+
+
+def test_watcher_stops_while_waiting():
+    """
+    Stopping the watcher ends the iteration right away, not when the next poll is due.
+    """
+    async def watch():
+        client = _get_presence_client([0])
+        watcher = client.presence.watch([1], offline_interval=60, emit_initial=True)
+        changes = []
+
+        async def iterate():
+            async for change in watcher:
+                changes.append(change)
+
+        task = asyncio.ensure_future(iterate())
+        while not changes:
+            await asyncio.sleep(0.01)
+        watcher.stop()
+        await task
+        return len(changes)
+
+    assert asyncio.run(asyncio.wait_for(watch(), timeout=5)) == 1
@@ -0,0 +1,48 @@
+"""
+
+Tests the rate limiter, using mocked responses.
+
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from roblox.utilities.ratelimit import RateLimiter
+from roblox.utilities.requests import CleanAsyncClient, Requests
+
+
+def test_waiting_requests_respect_retry_after():
+    """
+    Requests that were already waiting for a token when a 429 comes in must wait for the Retry-After window too, and
+    must be spaced out at the bucket's rate once it ends.
+    """
+    retry_after = 0.5
+    sent = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(time.monotonic())
+        # give the other requests time to start waiting for a token before the 429 comes back
+        await asyncio.sleep(0.02)
+        if len(sent) == 1:
+            return httpx.Response(429, request=request, headers={"Retry-After": str(retry_after)}, json={})
+        return httpx.Response(200, request=request, json={})
+
+    async def send():
+        requests = Requests(
+            session=CleanAsyncClient(transport=httpx.MockTransport(handler)),
+            rate_limiter=RateLimiter(default_rate=20, burst=1, adaptive=False)
+        )
+        await asyncio.gather(
+            *[requests.get("https://users.roblox.com/v1/users/1") for _ in range(8)],
+            return_exceptions=True
+        )
+
+    asyncio.run(asyncio.wait_for(send(), timeout=10))
+
+    blocked_at = sent[0]
+    later = sent[1:]
+    assert len(later) == 7
+    assert all(sent_at >= blocked_at + retry_after - 0.01 for sent_at in later)
+    assert all(second - first >= 0.05 - 0.01 for first, second in zip(later, later[1:]))